@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Seeding Pipeline Benchmark
+Runs the stages of insert_complete_dummy_data.py at several dataset sizes
+against in-memory and on-disk SQLite, records rows/sec, wall time and peak
+memory, and compares them with a JSON baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import insert_complete_dummy_data as seeder
+
+# Baseline file read and (with --update-baseline) written
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Dataset sizes (number of users) and backends measured by default
+SIZES = [100, 1000]
+BACKENDS = ["memory", "disk"]
+
+# Runs per case; the fastest run is kept to smooth out noise
+REPEAT = 3
+
+# Allowed slowdown in rows/sec (and growth in peak memory) before a stage counts as regressed
+THRESHOLD = 0.2
+
+# Fixed seed so every run generates the same dataset
+BENCHMARK_SEED = 2025
+
+def select_players_within_budget(conn):
+    """Pick a lineup for every UserRoundTeams budget with one optimizer and buffer, like insert_fantasy_teams"""
+    catalog = seeder.PlayerCatalog(conn.execute("SELECT Id, Position, Cost FROM Players").fetchall())
+    optimizer = seeder.LineupOptimizer(catalog)
+    lineup = array("i", [0]) * seeder.LINEUP_SIZE
+    
+    lineups = 0
+    for (budget,) in conn.execute("SELECT UsedBudget FROM UserRoundTeams"):
+        optimizer.select_into(budget, lineup)
+        lineups += 1
+    return lineups
+
+def validate_fantasy_teams(conn):
+    """Validate every fantasy team on the benchmark connection"""
+    return seeder.validate_fantasy_teams(conn)["teams"]
+
+# Every step of a seed run in order; each returns the number of rows it handled
+PIPELINE = [
+    ("insert_teams", seeder.insert_teams),
+    ("insert_players", seeder.insert_players),
+    ("insert_users", seeder.insert_users),
+    ("insert_user_round_teams", seeder.insert_user_round_teams),
+    ("select_players_within_budget", select_players_within_budget),
+    ("insert_fantasy_teams", seeder.insert_fantasy_teams),
+    ("insert_player_round_points", seeder.insert_player_round_points),
+    ("insert_user_round_points", seeder.insert_user_round_points),
+    ("add_total_points", seeder.add_total_points),
+    ("validate_fantasy_teams", validate_fantasy_teams),
+]
+
+# Steps that are measured by default; the others only prepare their input
+STAGES = ["insert_players", "insert_fantasy_teams", "select_players_within_budget",
+          "insert_player_round_points", "insert_user_round_points", "validate_fantasy_teams"]
+
+def load_schema(path):
+    """CREATE statements of every schema object in the database at path"""
+    if not os.path.exists(path):
+        sys.exit(f"❌ Schema database {path} not found; start the app once to create it or pass --schema")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return [sql for _, _, sql in seeder.schema_objects(conn)]
+    finally:
+        conn.close()
+
+def run_case(backend, num_users, stages, schema):
+    """Run the whole pipeline once on a fresh database and measure the given stages.
+    
+    Runs in its own process so peak memory belongs to this case alone.
+    """
+    seeder.NUM_USERS = num_users
+    seeder.SEED = BENCHMARK_SEED
+    seeder.WORKERS = 1
+    random.seed(BENCHMARK_SEED)
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = ":memory:" if backend == "memory" else os.path.join(directory, "benchmark.db")
+        conn = sqlite3.connect(path)
+        try:
+            for sql in schema:
+                conn.execute(sql)
+            conn.commit()
+            
+            for name, stage in PIPELINE:
+                start = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    rows = stage(conn)
+                    conn.commit()
+                elapsed = time.perf_counter() - start
+                if name in stages:
+                    results[name] = {
+                        "rows": rows,
+                        "seconds": elapsed,
+                        "rows_per_sec": rows / elapsed if elapsed > 0 else 0,
+                        "peak_rss_mb": seeder.peak_rss_mb(),
+                    }
+        finally:
+            conn.close()
+    return results
+
+def run_benchmarks(sizes, backends, stages, schema, repeat):
+    """Map "backend/users/stage" -> the fastest of repeat measurements"""
+    results = {}
+    for backend in backends:
+        for num_users in sizes:
+            for _ in range(repeat):
+                with ProcessPoolExecutor(1) as pool:
+                    case = pool.submit(run_case, backend, num_users, stages, schema).result()
+                for name, result in case.items():
+                    key = f"{backend}/{num_users}/{name}"
+                    if key not in results or result["seconds"] < results[key]["seconds"]:
+                        results[key] = result
+                    print(f"  {key}: {result['rows']} rows in {result['seconds']:.3f}s "
+                          f"({result['rows_per_sec']:,.0f} rows/s)")
+    return results
+
+def find_regressions(results, baseline, threshold):
+    """Describe every stage that got slower or bigger than its baseline by more than threshold"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["rows_per_sec"] < base["rows_per_sec"] * (1 - threshold):
+            regressions.append(f"{key}: {result['rows_per_sec']:,.0f} rows/s, "
+                               f"baseline {base['rows_per_sec']:,.0f} rows/s")
+        if (result["peak_rss_mb"] is not None and base.get("peak_rss_mb") is not None
+                and result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold)):
+            regressions.append(f"{key}: peak RSS {result['peak_rss_mb']:.1f} MB, "
+                               f"baseline {base['peak_rss_mb']:.1f} MB")
+    return regressions
+
+def environment():
+    """Versions that affect the numbers, stored with the baseline"""
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "numpy": seeder.np.__version__ if seeder.np is not None else None,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the dummy data seeding stages")
+    parser.add_argument("--sizes", type=seeder.positive_int, nargs="+", default=SIZES,
+                        help=f"numbers of users to benchmark (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument("--backends", choices=BACKENDS, nargs="+", default=BACKENDS,
+                        help="SQLite databases to benchmark against (default: memory and disk)")
+    parser.add_argument("--stages", choices=[name for name, _ in PIPELINE], nargs="+", default=STAGES,
+                        help="stages to measure (default: the main seeding stages)")
+    parser.add_argument("--repeat", type=seeder.positive_int, default=REPEAT,
+                        help=f"runs per case, the fastest is kept (default: {REPEAT})")
+    parser.add_argument("--schema", default=seeder.DB_PATH,
+                        help=f"database created by the app to copy the schema from (default: {seeder.DB_PATH})")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help=f"JSON baseline to compare against (default: {BASELINE_PATH})")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"allowed fractional regression per stage (default: {THRESHOLD})")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write these results as the new baseline instead of comparing")
+    return parser.parse_args()
+
+def main():
+    """Run the benchmarks and compare them with (or record) the baseline"""
+    args = parse_args()
+    schema = load_schema(args.schema)
+    
+    print("Benchmarking dummy data seeding...")
+    print(f"Sizes: {', '.join(map(str, args.sizes))} users, backends: {', '.join(args.backends)}")
+    print("-" * 50)
+    results = run_benchmarks(args.sizes, args.backends, args.stages, schema, args.repeat)
+    print("-" * 50)
+    
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as baseline_file:
+            json.dump({"environment": environment(), "results": results}, baseline_file, indent=2, sort_keys=True)
+        print(f"📝 Baseline written to {args.baseline}")
+        return
+    
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("environment") != environment():
+        print("⚠️ Baseline was recorded in a different environment; comparing anyway")
+    
+    regressions = find_regressions(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} regressions past {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  • {regression}")
+        sys.exit(1)
+    print(f"✅ No stage regressed past {args.threshold:.0%} of {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Columnar Dataset Export and Loader
+Exports the seeded tables to memory-mappable NumPy structured arrays plus a
+shared string table, and loads such a "golden dataset" back into a database
+without re-running the generator
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import insert_complete_dummy_data as seeder
+
+np = seeder.np
+
+# Bumped whenever the file layout changes; the loader refuses other versions
+FORMAT_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+STRINGS_NAME = "strings.bin"
+STRING_OFFSETS_NAME = "string_offsets.npy"
+
+# Seeded tables in the order they can be loaded (parents first)
+TABLES = list(reversed(seeder.SEEDED_TABLES))
+
+def column_kind(declared_type):
+    """Storage kind of a column from its declared SQLite type"""
+    declared_type = declared_type.upper()
+    if "CHAR" in declared_type or "TEXT" in declared_type or "CLOB" in declared_type:
+        return "text"
+    if "REAL" in declared_type or "FLOA" in declared_type or "DOUB" in declared_type:
+        return "real"
+    return "int"
+
+def smallest_int_dtype(low, high):
+    """Smallest signed NumPy integer type holding every value in low..high"""
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    raise ValueError(f"Integers {low}..{high} do not fit in 64 bits")
+
+class StringTable:
+    """Deduplicated strings shared by every text column, referenced by int32 codes (-1 is NULL)"""
+    
+    def __init__(self):
+        self.codes = {}
+        self.strings = []
+    
+    def code(self, value):
+        """Code of value, adding it to the table on first use"""
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+    
+    def save(self, directory):
+        """Write the UTF-8 bytes of all strings back to back plus their start offsets"""
+        encoded = [value.encode() for value in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        with open(os.path.join(directory, STRINGS_NAME), "wb") as strings_file:
+            strings_file.write(b"".join(encoded))
+        np.save(os.path.join(directory, STRING_OFFSETS_NAME), offsets)
+
+def load_strings(directory):
+    """Decode the string table written by StringTable.save into a list indexed by code"""
+    offsets = np.load(os.path.join(directory, STRING_OFFSETS_NAME), mmap_mode="r").tolist()
+    with open(os.path.join(directory, STRINGS_NAME), "rb") as strings_file:
+        blob = strings_file.read()
+    return [blob[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+def table_columns(conn, table):
+    """Column specs of table: name, kind, whether it holds NULLs and the NumPy dtype to store it as"""
+    names_and_kinds = [(row[1], column_kind(row[2])) for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    aggregates = ", ".join(f'MIN("{name}"), MAX("{name}"), COUNT("{name}")' for name, _ in names_and_kinds)
+    row_count, *stats = conn.execute(f'SELECT COUNT(*), {aggregates} FROM "{table}"').fetchone()
+    
+    columns = []
+    for index, (name, kind) in enumerate(names_and_kinds):
+        low, high, non_null = stats[3 * index:3 * index + 3]
+        if kind == "text":
+            dtype = np.dtype(np.int32)
+        elif kind == "real":
+            dtype = np.dtype(np.float64)
+        else:
+            dtype = smallest_int_dtype(low or 0, high or 0)
+        columns.append({"name": name, "kind": kind, "nullable": non_null < row_count, "dtype": dtype.str})
+    return row_count, columns
+
+def structured_dtype(columns):
+    """Record dtype of a table file; nullable numeric columns get an extra <name>__null flag"""
+    fields = []
+    for column in columns:
+        fields.append((column["name"], column["dtype"]))
+        if column["nullable"] and column["kind"] != "text":
+            fields.append((column["name"] + "__null", "?"))
+    return np.dtype(fields)
+
+def export_table(conn, table, directory, strings):
+    """Stream table into <table>.npy in BATCH_SIZE row slices and return its manifest entry"""
+    row_count, columns = table_columns(conn, table)
+    path = os.path.join(directory, f"{table}.npy")
+    data = np.lib.format.open_memmap(path, mode="w+", dtype=structured_dtype(columns), shape=(row_count,))
+    
+    names = ", ".join(f'"{column["name"]}"' for column in columns)
+    cursor = conn.execute(f'SELECT {names} FROM "{table}"')
+    start = 0
+    while True:
+        rows = cursor.fetchmany(seeder.BATCH_SIZE)
+        if not rows:
+            break
+        stop = start + len(rows)
+        for column, values in zip(columns, zip(*rows)):
+            name = column["name"]
+            if column["kind"] == "text":
+                values = [strings.code(value) for value in values]
+            elif column["nullable"]:
+                data[name + "__null"][start:stop] = [value is None for value in values]
+                values = [0 if value is None else value for value in values]
+            data[name][start:stop] = values
+        start = stop
+    data.flush()
+    del data
+    return {"name": table, "rows": row_count, "columns": columns}
+
+def file_sha256(path):
+    """SHA-256 of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def latest_migration(conn):
+    """Id of the newest applied EF migration, or None when the database has no migration history"""
+    try:
+        row = conn.execute(
+            'SELECT MigrationId FROM "__EFMigrationsHistory" ORDER BY MigrationId DESC LIMIT 1').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+def check_schema(conn, manifest):
+    """Raise ValueError unless conn is at the manifest's migration and its tables have the exported columns.
+
+    Tables missing from conn are left for load_dataset to skip.
+    """
+    migration = latest_migration(conn)
+    if migration != manifest["migration"]:
+        raise ValueError(f"Dataset was exported at migration {manifest['migration']}, "
+                         f"but {seeder.DB_PATH} is at {migration}")
+    for table in manifest["tables"]:
+        columns = {row[1]: column_kind(row[2]) for row in conn.execute(f'PRAGMA table_info("{table["name"]}")')}
+        exported = {column["name"]: column["kind"] for column in table["columns"]}
+        if columns and columns != exported:
+            raise ValueError(f"Columns of {table['name']} in {seeder.DB_PATH} do not match the dataset: "
+                             f"{', '.join(sorted(columns))} vs {', '.join(sorted(exported))}")
+
+def export_dataset(directory):
+    """Export every seeded table of DB_PATH into directory and write its manifest last"""
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(f"file:{seeder.DB_PATH}?mode=ro", uri=True)
+    try:
+        existing = {name for _, name, _ in seeder.schema_objects(conn)}
+        migration = latest_migration(conn)
+        strings = StringTable()
+        tables = []
+        for table in TABLES:
+            if table in existing:
+                tables.append(export_table(conn, table, directory, strings))
+                print(f"  {table}: {tables[-1]['rows']} rows")
+        strings.save(directory)
+    finally:
+        conn.close()
+    
+    files = [f"{table['name']}.npy" for table in tables] + [STRINGS_NAME, STRING_OFFSETS_NAME]
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "source": seeder.DB_PATH,
+        "migration": migration,
+        "tables": tables,
+        "sha256": {name: file_sha256(os.path.join(directory, name)) for name in files},
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+def read_manifest(directory, verify=True):
+    """Load the manifest of an exported dataset, checking its version and (optionally) file checksums"""
+    with open(os.path.join(directory, MANIFEST_NAME)) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Dataset format {manifest['format_version']} is not supported (expected {FORMAT_VERSION})")
+    if verify:
+        for name, digest in manifest["sha256"].items():
+            if file_sha256(os.path.join(directory, name)) != digest:
+                raise ValueError(f"{name} does not match its checksum")
+    return manifest
+
+def column_chunks(data, columns, strings, batch_size):
+    """Yield executemany parameters for memory-mapped table data, one slice of batch_size at a time.
+
+    Each slice is converted column by column; the row tuples sqlite3 needs are
+    only zipped together lazily while executemany consumes them.
+    """
+    for start in range(0, len(data), batch_size):
+        chunk = data[start:start + batch_size]
+        values = []
+        for column in columns:
+            column_values = chunk[column["name"]]
+            if column["kind"] == "text":
+                values.append([strings[code] if code >= 0 else None for code in column_values.tolist()])
+            elif column["nullable"]:
+                values.append(np.where(chunk[column["name"] + "__null"], None,
+                                       column_values.astype(object)).tolist())
+            else:
+                values.append(column_values.tolist())
+        yield zip(*values)
+
+def load_dataset(directory, verify=True):
+    """Replace the seeded tables of DB_PATH with an exported dataset in one bulk-load transaction.
+
+    Refuses (ValueError) before touching any data when DB_PATH has another
+    migration or other columns than the dataset was exported with.
+    """
+    manifest = read_manifest(directory, verify)
+    strings = load_strings(directory)
+    
+    row_count = 0
+    with seeder.bulk_load_connection() as conn:
+        # Only the summary tables the dataset has; they are opt-in (--leaderboards) in the seeder
+        seeder.create_summary_tables(conn, [table["name"] for table in manifest["tables"]
+                                            if table["name"] in seeder.SUMMARY_TABLES])
+        check_schema(conn, manifest)
+        existing = {name for _, name, _ in seeder.schema_objects(conn)}
+        seeder.clear_database(conn)
+        cursor = conn.cursor()
+        for table in manifest["tables"]:
+            if table["name"] not in existing:
+                print(f"⚠️ Skipping {table['name']}: the table does not exist in {seeder.DB_PATH}")
+                continue
+            columns = table["columns"]
+            data = np.load(os.path.join(directory, f"{table['name']}.npy"), mmap_mode="r")
+            names = ", ".join(f'"{column["name"]}"' for column in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            sql = f'INSERT INTO "{table["name"]}" ({names}) VALUES ({placeholders})'
+            for rows in column_chunks(data, columns, strings, seeder.BATCH_SIZE):
+                cursor.executemany(sql, rows)
+            row_count += len(data)
+            print(f"  {table['name']}: {len(data)} rows")
+    return row_count
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Export the seeded tables to columnar files or load them back")
+    parser.add_argument("command", choices=["export", "load"],
+                        help="export DB_PATH to DIRECTORY, or load DIRECTORY into DB_PATH")
+    parser.add_argument("directory", help="directory holding the columnar dataset")
+    parser.add_argument("--db", default=seeder.DB_PATH,
+                        help=f"database to export from or load into (default: {seeder.DB_PATH})")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="skip checking file checksums before loading")
+    return parser.parse_args()
+
+def main():
+    """Export or load a columnar dataset"""
+    args = parse_args()
+    if np is None:
+        sys.exit("❌ NumPy is required for columnar datasets (pip install numpy)")
+    seeder.DB_PATH = args.db
+    
+    start = time.perf_counter()
+    if args.command == "export":
+        print(f"Exporting {seeder.DB_PATH} to {args.directory}...")
+        manifest = export_dataset(args.directory)
+        rows = sum(table["rows"] for table in manifest["tables"])
+        print(f"✅ Exported {rows} rows in {time.perf_counter() - start:.2f}s")
+    else:
+        print(f"Loading {args.directory} into {seeder.DB_PATH}...")
+        try:
+            rows = load_dataset(args.directory, verify=not args.no_verify)
+        except ValueError as error:
+            sys.exit(f"❌ {error}")
+        elapsed = time.perf_counter() - start
+        print(f"✅ Loaded {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
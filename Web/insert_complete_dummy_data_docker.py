@@ -4,14 +4,58 @@ Complete Fantasy Basketball Dummy Data Script - Docker Version
 Creates comprehensive test data for 5 users across 22 rounds
 """
 
+import ctypes
+import ctypes.util
+import json
+import os
+import select
 import sqlite3
 import hashlib
 import random
+import time
 from datetime import datetime
 
 # Database file path for Docker
 DB_PATH = "/app/data/app.db"
 
+# Prebuilt dataset snapshots live next to the database (set SEED_SNAPSHOTS=0 to always regenerate)
+SNAPSHOT_DIR = os.environ.get("SEED_SNAPSHOT_DIR", "/app/data/snapshots")
+USE_SNAPSHOTS = os.environ.get("SEED_SNAPSHOTS", "1") != "0"
+
+# Fixed RNG seed so a snapshot always matches what the generator would produce
+RANDOM_SEED = int(os.environ.get("SEED_RANDOM_SEED", "2025"))
+
+# Bump when the generation logic changes in a way the config below does not capture
+SEEDER_VERSION = 1
+
+# Current round set after seeding
+CURRENT_ROUND = 1
+
+# Seconds to wait for the .NET application to create the schema
+SCHEMA_TIMEOUT = float(os.environ.get("SEED_SCHEMA_TIMEOUT", "120"))
+
+# Tables and columns the seeder reads or writes, as created by the .NET application
+EXPECTED_SCHEMA = {
+    "CurrentRound": {"Id", "RoundNumber"},
+    "Teams": {"Id", "Name"},
+    "Players": {"Id", "TeamId", "Name", "Position", "Cost", "TotalPoints"},
+    "Users": {"Id", "Name", "Email", "PasswordHash", "TotalPoints"},
+    "UserRoundTeams": {"Id", "UserId", "Round", "TotalBudget", "UsedBudget", "IsLocked"},
+    "UserRoundPoints": {"Id", "UserId", "Round", "Points"},
+    "PlayerRoundPoints": {"Id", "PlayerId", "Round", "Points", "Rebounds", "Assists", "Steals",
+                          "Blocks", "Turnovers", "TeamWin", "FantasyPoints", "Score", "TotalPoints"},
+    "FantasyTeams": {"Id", "UserId", "PlayerId", "Round", "IsActive", "IsOnCourt"},
+}
+
+# Latest EF migration; only checked when the app records migrations in __EFMigrationsHistory
+EXPECTED_MIGRATION = "20250923194945_UpdatePlayerRoundPointsSchema"
+
+# inotify event mask: anything that can mean the database or its journal changed
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
 # Team names (12 teams)
 TEAMS = [
     "Breidablik", "Fjölnir", "Fylkir", "Hamar", "Haukar", "Hottur",
@@ -126,32 +170,90 @@ def clear_database():
     conn.commit()
     conn.close()
 
-def wait_for_tables():
-    """Wait for tables to be created by the .NET application"""
-    import time
-    max_attempts = 30
-    attempt = 0
+def schema_problems():
+    """Return what is still missing from the schema the seeder needs (empty when ready)"""
+    if not os.path.exists(DB_PATH):
+        return ["database file does not exist"]
     
-    while attempt < max_attempts:
+    problems = []
+    try:
+        # Read-only, so checking never creates the database file
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
         try:
-            conn = sqlite3.connect(DB_PATH)
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Users'")
-            result = cursor.fetchone()
-            conn.close()
+            for table, columns in EXPECTED_SCHEMA.items():
+                cursor.execute(f'PRAGMA table_info("{table}")')
+                existing = {row[1] for row in cursor.fetchall()}
+                if not existing:
+                    problems.append(f"table {table} is missing")
+                elif columns - existing:
+                    problems.append(f"table {table} lacks {', '.join(sorted(columns - existing))}")
             
-            if result:
-                print("Database tables found!")
-                return True
-        except sqlite3.OperationalError:
-            pass
-        
-        attempt += 1
-        print(f"Waiting for database tables... (attempt {attempt}/{max_attempts})")
-        time.sleep(1)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='__EFMigrationsHistory'")
+            if cursor.fetchone():
+                cursor.execute('SELECT 1 FROM "__EFMigrationsHistory" WHERE MigrationId = ?', (EXPECTED_MIGRATION,))
+                if not cursor.fetchone():
+                    problems.append(f"migration {EXPECTED_MIGRATION} not applied")
+        finally:
+            conn.close()
+    except sqlite3.Error as error:
+        problems.append(f"database not readable yet ({error})")
+    return problems
+
+def open_inotify(directory):
+    """Watch a directory for file changes with inotify; returns a file descriptor, or None if unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, directory.encode(), IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (AttributeError, OSError):  # Not Linux, or no usable libc
+        return None
+
+def wait_for_schema(timeout=SCHEMA_TIMEOUT):
+    """Wait until the .NET application has created every table and column the seeder needs.
+
+    Re-checks whenever something in the database directory changes (inotify),
+    falling back to polling with exponential backoff where inotify is not
+    available. Returns as soon as the schema is complete.
+    """
+    directory = os.path.dirname(os.path.abspath(DB_PATH))
+    os.makedirs(directory, exist_ok=True)
+    fd = open_inotify(directory)
+    deadline = time.monotonic() + timeout
+    delay = 0.05
     
-    print("Warning: Database tables not found after waiting. Proceeding anyway...")
-    return False
+    try:
+        while True:
+            problems = schema_problems()
+            if not problems:
+                print("Database schema is ready!")
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"Warning: Database schema not ready after {timeout:g}s ({'; '.join(problems)}). Proceeding anyway...")
+                return False
+            
+            if fd is not None:
+                # Wake on the next change, re-checking at least once a second in case an event was missed
+                readable, _, _ = select.select([fd], [], [], min(remaining, 1.0))
+                if readable:
+                    try:
+                        while os.read(fd, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+            else:
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 1.0)
+    finally:
+        if fd is not None:
+            os.close(fd)
 
 def insert_teams():
     """Insert all teams"""
@@ -211,7 +313,7 @@ def insert_users():
     print(f"Inserted {len(USERS)} users")
 
 def create_current_round_table():
-    """Create CurrentRound table and set current round to 1"""
+    """Create CurrentRound table and set current round to CURRENT_ROUND"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
@@ -225,11 +327,82 @@ def create_current_round_table():
     
     # Clear any existing data and insert current round
     cursor.execute("DELETE FROM CurrentRound")
-    cursor.execute("INSERT INTO CurrentRound (RoundNumber) VALUES (1)")
+    cursor.execute("INSERT INTO CurrentRound (RoundNumber) VALUES (?)", (CURRENT_ROUND,))
     
     conn.commit()
     conn.close()
-    print("Created CurrentRound table and set current round to 1")
+    print(f"Created CurrentRound table and set current round to {CURRENT_ROUND}")
+
+def dataset_fingerprint():
+    """Fingerprint of everything that determines the seeded dataset.
+
+    Covers the seeder config, the RNG seed and the schema: the EF migration
+    history when __EFMigrationsHistory exists, plus the table definitions
+    (the app uses EnsureCreated, which records no migration history).
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'index') AND sql IS NOT NULL ORDER BY name")
+    schema = cursor.fetchall()
+    
+    migrations = []
+    if any(name == "__EFMigrationsHistory" for name, _ in schema):
+        cursor.execute('SELECT MigrationId, ProductVersion FROM "__EFMigrationsHistory" ORDER BY MigrationId')
+        migrations = cursor.fetchall()
+    
+    conn.close()
+    
+    config = {
+        "version": SEEDER_VERSION,
+        "seed": RANDOM_SEED,
+        "teams": TEAMS,
+        "players": PLAYERS_BY_TEAM,
+        "users": USERS,
+        "positions": POSITIONS,
+        "current_round": CURRENT_ROUND,
+        "migrations": migrations,
+        "schema": schema,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+def snapshot_path(fingerprint):
+    """Snapshot file for a dataset fingerprint"""
+    return os.path.join(SNAPSHOT_DIR, f"seed-{fingerprint[:16]}.db")
+
+def restore_snapshot(path):
+    """Copy a snapshot into the live database with the SQLite backup API"""
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(DB_PATH)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+def save_snapshot(path):
+    """Store the freshly seeded database as the snapshot for its fingerprint.
+
+    Written to a temporary file and renamed so a crash never leaves a partial
+    snapshot behind; snapshots for other fingerprints are removed.
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    temp_path = path + ".tmp"
+    
+    source = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    os.replace(temp_path, path)
+    
+    for name in os.listdir(SNAPSHOT_DIR):
+        stale = os.path.join(SNAPSHOT_DIR, name)
+        if name.startswith("seed-") and stale != path:
+            os.remove(stale)
+    print(f"Saved dataset snapshot {path}")
 
 def main():
     """Main function to populate database"""
@@ -241,18 +414,31 @@ def main():
     print(f"Rounds: 1 (current round set to 1)")
     print("-" * 50)
     
-    # Wait for tables to be created by the .NET application
-    wait_for_tables()
+    # Wait for the schema to be created by the .NET application
+    wait_for_schema()
     
-    # Clear existing data
-    clear_database()
+    random.seed(RANDOM_SEED)
+    start = time.perf_counter()
     
-    # Insert data in dependency order
-    insert_teams()
-    insert_players()
-    insert_users()
-    create_current_round_table()
+    snapshot = snapshot_path(dataset_fingerprint()) if USE_SNAPSHOTS else None
+    if snapshot and os.path.exists(snapshot):
+        # Same config, seed and schema as a previous start: reuse its dataset
+        restore_snapshot(snapshot)
+        print(f"Restored dataset snapshot {snapshot}")
+    else:
+        # Clear existing data
+        clear_database()
+        
+        # Insert data in dependency order
+        insert_teams()
+        insert_players()
+        insert_users()
+        create_current_round_table()
+        
+        if snapshot:
+            save_snapshot(snapshot)
     
+    print(f"Seeding took {time.perf_counter() - start:.2f}s")
     print("-" * 50)
     print("✅ Complete dummy data insertion finished!")
     print("\n📊 Summary:")
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+API Load Generator
+Replays a weighted mix of API requests for the users, players and rounds
+seeded by insert_complete_dummy_data.py at a target rate over a pool of
+keep-alive connections, and reports latency percentiles per endpoint.
+The write endpoints (create-team, playerroundpoints/bulk) change the data of
+the server they hit, so they only run against --stand-in or with --allow-writes
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+import sqlite3
+import sys
+from urllib.parse import urlsplit
+
+import insert_complete_dummy_data as seeder
+
+# API the requests are sent to (the "http" profile in Properties/launchSettings.json)
+BASE_URL = "http://localhost:5062/api"
+
+# Requests per second, test length in seconds and keep-alive connections in the pool
+RPS = 20
+DURATION = 30
+CONNECTIONS = 10
+
+# Player rows sent in each /playerroundpoints/bulk request
+BULK_SIZE = 10
+
+# Fraction of failed requests (errors or non-2xx responses) above which the run fails
+MAX_ERROR_RATE = 0.01
+
+# Latency percentiles reported per endpoint
+PERCENTILES = [50, 95, 99]
+
+# Path template and default weight of every endpoint in the mix; non-GET endpoints write to the server
+ENDPOINTS = {
+    "leaderboard": ("GET", "/statistics/leaderboard", 3),
+    "round-leaderboard": ("GET", "/statistics/leaderboard/round/{round}", 3),
+    "round-summary": ("GET", "/statistics/round-summary/{round}", 2),
+    "team-summary": ("GET", "/fantasyteammanagement/user/{userId}/team-summary", 4),
+    "create-team": ("POST", "/fantasyteammanagement/create-team", 1),
+    "player-round-points-bulk": ("POST", "/playerroundpoints/bulk", 1),
+}
+
+PRP_FIELDS = ["playerId", "round", "points", "rebounds", "assists", "steals", "blocks",
+              "turnovers", "teamWin", "fantasyPoints", "score", "totalPoints"]
+
+def load_seeded_ids(db_path):
+    """User ids, player ids by position, seeded rounds and the current round from the seeded database"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        user_ids = [row[0] for row in conn.execute("SELECT Id FROM Users ORDER BY Id")]
+        players_by_position = {}
+        for player_id, position in conn.execute("SELECT Id, Position FROM Players ORDER BY Id"):
+            players_by_position.setdefault(position, []).append(player_id)
+        rounds = [row[0] for row in conn.execute("SELECT DISTINCT Round FROM UserRoundTeams ORDER BY Round")]
+        try:
+            current_round = conn.execute("SELECT RoundNumber FROM CurrentRound").fetchone()
+        except sqlite3.OperationalError:
+            current_round = None
+    finally:
+        conn.close()
+    
+    if not user_ids or not rounds or any(len(players_by_position.get(position, [])) < 2
+                                         for position in seeder.POSITIONS):
+        raise ValueError(f"{db_path} has no seeded users, rounds or lineups; run insert_complete_dummy_data.py first")
+    return {
+        "user_ids": user_ids,
+        "players_by_position": players_by_position,
+        "player_ids": [player_id for ids in players_by_position.values() for player_id in ids],
+        "rounds": rounds,
+        "current_round": current_round[0] if current_round else rounds[-1] + 1,
+    }
+
+class RequestFactory:
+    """Builds (method, path, body) for each endpoint from the seeded ids"""
+    
+    def __init__(self, ids, rng):
+        self.ids = ids
+        self.rng = rng
+        # Every (user, round) pair without a team yet, so create-team is not rejected as a duplicate
+        self.new_teams = ((user_id, round_num) for round_num in itertools.count(ids["current_round"])
+                          for user_id in ids["user_ids"])
+        # Bulk player points are posted for the current round
+        self.points_rounds = range(ids["current_round"], ids["current_round"] + 1)
+    
+    def build(self, name):
+        """Request for one call to endpoint name"""
+        method, template, _ = ENDPOINTS[name]
+        rng = self.rng
+        path = template.format(round=rng.choice(self.ids["rounds"]), userId=rng.choice(self.ids["user_ids"]))
+        body = None
+        if name == "create-team":
+            user_id, round_num = next(self.new_teams)
+            player_ids = [player_id for position in seeder.POSITIONS
+                          for player_id in rng.sample(self.ids["players_by_position"][position], 2)]
+            body = {"userId": user_id, "round": round_num, "playerIds": player_ids}
+        elif name == "player-round-points-bulk":
+            player_ids = rng.sample(self.ids["player_ids"], min(BULK_SIZE, len(self.ids["player_ids"])))
+            body = []
+            for row in seeder.scalar_player_round_point_rows(player_ids, rng, self.points_rounds):
+                record = dict(zip(PRP_FIELDS, row))
+                record["teamWin"] = bool(record["teamWin"])
+                body.append(record)
+        return method, path, body
+
+class ConnectionPool:
+    """At most size keep-alive HTTP/1.1 connections to one server, reused across requests"""
+    
+    def __init__(self, base_url, size):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = url.scheme == "https"
+        self.prefix = url.path.rstrip("/")
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+    
+    async def request(self, method, path, body=None):
+        """Send one request and return the response status; a stale idle connection is retried once on a new one"""
+        payload = json.dumps(body).encode() if body is not None else b""
+        async with self.slots:
+            while True:
+                reused = bool(self.idle)
+                reader, writer = self.idle.pop() if reused else await asyncio.open_connection(
+                    self.host, self.port, ssl=self.ssl)
+                try:
+                    status, keep_alive = await self.exchange(reader, writer, method, self.prefix + path, payload)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status
+    
+    async def exchange(self, reader, writer, method, path, payload):
+        """Write the request, read the whole response and return (status, whether the connection stays open)"""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Accept: application/json",
+                f"Content-Length: {len(payload)}"]
+        if payload:
+            head.append("Content-Type: application/json")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
+        
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = await read_headers(reader)
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    # Skip any trailers up to the final blank line
+                    await read_headers(reader)
+                    break
+                await reader.readexactly(size + 2)
+        elif "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        elif status >= 200 and status not in (204, 304):
+            # No length given: the body runs to the end of the connection
+            await reader.read()
+            return status, False
+        return status, headers.get("connection", "").lower() != "close"
+    
+    async def close(self):
+        """Close every idle connection"""
+        for _, writer in self.idle:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in self.idle), return_exceptions=True)
+        self.idle.clear()
+
+async def read_headers(reader):
+    """Read header lines up to the blank line into a lower-cased name -> value dict"""
+    headers = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+async def timed_request(pool, name, request, scheduled, results):
+    """Send one request and record its latency from the time it was scheduled to go out"""
+    loop = asyncio.get_running_loop()
+    result = results[name]
+    result["requests"] += 1
+    try:
+        status = await pool.request(*request)
+    except (OSError, asyncio.IncompleteReadError, ValueError) as error:
+        result["errors"] += 1
+        result["error_samples"].add(f"{type(error).__name__}: {error}")
+        return
+    result["latencies"].append(loop.time() - scheduled)
+    if not 200 <= status < 300:
+        result["errors"] += 1
+        result["error_samples"].add(f"HTTP {status}")
+
+async def run_load(pool, factory, mix, rps, duration):
+    """Start requests on a fixed schedule of rps per second for duration seconds and wait for them all.
+
+    The schedule does not wait for responses, so a slow server shows up as
+    latency (measured from the scheduled start) rather than as a lower rate.
+    """
+    loop = asyncio.get_running_loop()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results = {name: {"requests": 0, "latencies": [], "errors": 0, "error_samples": set()} for name in names}
+    pending = set()
+    
+    start = loop.time()
+    for index in range(max(1, round(rps * duration))):
+        scheduled = start + index / rps
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = factory.rng.choices(names, weights)[0]
+        task = asyncio.create_task(timed_request(pool, name, factory.build(name), scheduled, results))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+    return results, loop.time() - start
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+def summarize(results, elapsed):
+    """Per-endpoint counts, errors and latency percentiles in milliseconds"""
+    summary = {}
+    for name, result in results.items():
+        latencies = sorted(result["latencies"])
+        summary[name] = {
+            "requests": result["requests"],
+            "errors": result["errors"],
+            "error_samples": sorted(result["error_samples"])[:5],
+            **{f"p{percent}_ms": round(percentile(latencies, percent) * 1000, 2) if latencies else None
+               for percent in PERCENTILES},
+        }
+    total = sum(entry["requests"] for entry in summary.values())
+    return {"elapsed": round(elapsed, 3), "rps": round(total / elapsed, 2) if elapsed > 0 else 0,
+            "endpoints": summary}
+
+def stand_in_routes(prefix):
+    """(method, compiled path pattern, endpoint name) for every endpoint under prefix"""
+    return [(method, re.compile(re.escape(prefix) + re.sub(r"\\\{\w+\\\}", "[0-9]+", re.escape(template))), name)
+            for name, (method, template, _) in ENDPOINTS.items()]
+
+async def serve_stand_in(reader, writer, routes, teams):
+    """Answer requests on one connection like the real API would, without a database.
+
+    Unknown routes get 404 and a second create-team for the same user and
+    round gets 400, so a broken request mix fails the run.
+    """
+    try:
+        while True:
+            try:
+                request_line = await reader.readuntil(b"\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = await read_headers(reader)
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            
+            name = next((name for route_method, pattern, name in routes
+                         if route_method == method and pattern.fullmatch(path)), None)
+            status, response = 200, b"[]"
+            if name is None:
+                status, response = 404, b'"Not found"'
+            elif name == "create-team":
+                request = json.loads(body)
+                key = (request["userId"], request["round"])
+                if key in teams:
+                    status, response = 400, b'"User already has a fantasy team for this round"'
+                else:
+                    teams.add(key)
+                    response = b'{"message":"Fantasy team created successfully"}'
+            elif name == "player-round-points-bulk":
+                status, response = 201, body
+            elif name != "leaderboard" and name != "round-leaderboard":
+                response = b"{}"
+            
+            writer.write(f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(response)}\r\n\r\n".encode()
+                         + response)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+def print_report(summary):
+    """Per-endpoint table of requests, errors and latency percentiles"""
+    print(f"{'Endpoint':<26}{'Requests':>9}{'Errors':>8}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES))
+    for name, entry in summary["endpoints"].items():
+        latencies = "".join(f"{entry[f'p{p}_ms']:>10.1f}" if entry[f"p{p}_ms"] is not None else f"{'-':>10}"
+                            for p in PERCENTILES)
+        print(f"{name:<26}{entry['requests']:>9}{entry['errors']:>8}{latencies}")
+        for sample in entry["error_samples"]:
+            print(f"  • {sample}")
+
+async def run(args, ids, mix):
+    """Run the load test, against a local stand-in server when asked, and return its summary"""
+    server = None
+    base_url = args.base_url
+    if args.stand_in:
+        routes = stand_in_routes(urlsplit(base_url).path.rstrip("/"))
+        teams = set()
+        server = await asyncio.start_server(lambda reader, writer: serve_stand_in(reader, writer, routes, teams),
+                                            "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        base_url = f"http://127.0.0.1:{port}{urlsplit(base_url).path}"
+        print(f"Started stand-in server at {base_url}")
+    
+    pool = ConnectionPool(base_url, args.connections)
+    try:
+        results, elapsed = await run_load(pool, RequestFactory(ids, random.Random(args.seed)), mix,
+                                          args.rps, args.duration)
+    finally:
+        await pool.close()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    return summarize(results, elapsed)
+
+def mix_entry(value):
+    """argparse type for one endpoint=weight pair of --mix"""
+    name, _, weight = value.partition("=")
+    if name not in ENDPOINTS:
+        raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (choose from {', '.join(ENDPOINTS)})")
+    try:
+        weight = float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"weight of {name} must be a number")
+    if weight < 0:
+        raise argparse.ArgumentTypeError(f"weight of {name} must not be negative")
+    return name, weight
+
+def positive_float(value):
+    """argparse type for a number greater than zero"""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+    return number
+
+def write_endpoints():
+    """Names of the endpoints that change data on the server"""
+    return [name for name, (method, _, _) in ENDPOINTS.items() if method != "GET"]
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Put load on the API using the seeded users, players and rounds. The write endpoints "
+                    f"({', '.join(write_endpoints())}) create teams and player points on the server, so they "
+                    "are left out of the mix unless --stand-in or --allow-writes is given")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"API base URL (default: {BASE_URL})")
+    parser.add_argument("--db", default=seeder.DB_PATH,
+                        help=f"seeded database to read ids from (default: {seeder.DB_PATH})")
+    parser.add_argument("--rps", type=positive_float, default=RPS,
+                        help=f"requests started per second (default: {RPS})")
+    parser.add_argument("--duration", type=positive_float, default=DURATION,
+                        help=f"seconds to keep starting requests (default: {DURATION})")
+    parser.add_argument("--connections", type=seeder.positive_int, default=CONNECTIONS,
+                        help=f"keep-alive connections in the pool (default: {CONNECTIONS})")
+    parser.add_argument("--mix", type=mix_entry, nargs="+", metavar="ENDPOINT=WEIGHT",
+                        help="relative weights overriding the defaults; 0 disables an endpoint "
+                             f"(default: {' '.join(f'{name}={weight}' for name, (_, _, weight) in ENDPOINTS.items())})")
+    parser.add_argument("--seed", type=int, help="random seed for a repeatable request sequence")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="start a local server answering the same routes and send the load there (for CI)")
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="include the write endpoints when loading a real server (they change its data)")
+    parser.add_argument("--max-error-rate", type=float, default=MAX_ERROR_RATE,
+                        help=f"fail when more than this fraction of requests fail (default: {MAX_ERROR_RATE})")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON to PATH")
+    return parser.parse_args()
+
+def main():
+    """Run the load test and report latency per endpoint"""
+    args = parse_args()
+    mix = {name: weight for name, (_, _, weight) in ENDPOINTS.items()}
+    mix.update(args.mix or [])
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    writes = [name for name in write_endpoints() if name in mix]
+    if writes and not (args.allow_writes or args.stand_in):
+        requested = [name for name, weight in args.mix or [] if name in writes and weight > 0]
+        if requested:
+            sys.exit(f"❌ {', '.join(requested)} would write to {args.base_url}; pass --allow-writes to run it")
+        print(f"Leaving out the write endpoints {', '.join(writes)} (pass --allow-writes to include them)")
+        mix = {name: weight for name, weight in mix.items() if name not in writes}
+    if not mix:
+        sys.exit("❌ No endpoint in the mix has a weight above 0")
+    try:
+        ids = load_seeded_ids(args.db)
+    except (ValueError, sqlite3.Error) as error:
+        sys.exit(f"❌ {error}")
+    
+    print(f"Load testing {'a stand-in server' if args.stand_in else args.base_url}...")
+    print(f"{len(ids['user_ids'])} users, {len(ids['player_ids'])} players, rounds "
+          f"{ids['rounds'][0]}-{ids['rounds'][-1]}; {args.rps:g} requests/s for {args.duration:g}s "
+          f"over {args.connections} connections")
+    print("-" * 50)
+    summary = asyncio.run(run(args, ids, mix))
+    print_report(summary)
+    print("-" * 50)
+    
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(summary, json_file, indent=2)
+        print(f"📝 Results written to {args.json}")
+    
+    requests = sum(entry["requests"] for entry in summary["endpoints"].values())
+    errors = sum(entry["errors"] for entry in summary["endpoints"].values())
+    error_rate = errors / requests if requests else 0
+    if error_rate > args.max_error_rate:
+        sys.exit(f"❌ {errors} of {requests} requests failed ({error_rate:.1%}), above {args.max_error_rate:.1%}")
+    print(f"✅ {requests} requests in {summary['elapsed']:.1f}s ({summary['rps']:,.1f}/s), {errors} failed")
+
+if __name__ == "__main__":
+    main()
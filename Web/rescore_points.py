@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Bulk Re-scoring Job
+Recomputes PlayerRoundPoints.FantasyPoints/TotalPoints from the stored stat
+columns with the current (or overridden) scoring weights, then
+UserRoundPoints.Points, both TotalPoints columns and the leaderboard tables.
+Works in bounded transactions and resumes from its last checkpoint after an
+interruption; lineups are never modified
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+import insert_complete_dummy_data as seeder
+import scoring
+
+np = seeder.np
+
+# Job name of the checkpoints in the Checkpoints table
+JOB = "rescore"
+
+# Rows rescored per transaction; progress is checkpointed with every commit
+CHUNK_SIZE = 50_000
+
+def player_round_point_chunks(conn, weights, last_id, chunk_size):
+    """Rescore PlayerRoundPoints after last_id one chunk at a time, yielding (last id, rows changed) per chunk.
+
+    Only rows whose score changes are written.
+    """
+    while True:
+        rows = conn.execute("""
+            SELECT Id, Points, Rebounds, Assists, Steals, Blocks, Turnovers, TeamWin, FantasyPoints, TotalPoints
+            FROM PlayerRoundPoints WHERE Id > ? ORDER BY Id LIMIT ?
+        """, (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        ids, *stats, old_fantasy_points, old_total_points = zip(*rows)
+        if np is not None and seeder.USE_NUMPY:
+            columns = dict(zip([*scoring.STATISTICS, "team_win"], map(np.array, stats)))
+            scores = scoring.fantasy_points_array(columns, weights).tolist()
+        else:
+            scores = [scoring.fantasy_points(*line, weights=weights) for line in zip(*stats)]
+        
+        changed = [(score, score, row_id) for row_id, score, fantasy_points, total_points
+                   in zip(ids, scores, old_fantasy_points, old_total_points)
+                   if score != fantasy_points or score != total_points]
+        conn.executemany("UPDATE PlayerRoundPoints SET FantasyPoints = ?, TotalPoints = ? WHERE Id = ?", changed)
+        last_id = ids[-1]
+        yield last_id, len(changed)
+
+def user_round_point_chunks(conn, rounds, last_id, chunk_size):
+    """Rescore the UserRoundPoints in rounds of users after last_id from their lineups, yielding (last user id, rows changed).
+
+    Uses the seeder's scoring of FantasyTeams, so a round without a complete
+    team scores 0. Only existing rows are updated.
+    """
+    fantasy_points = seeder.load_fantasy_points_index(conn, rounds)
+    users_per_chunk = max(1, chunk_size // max(1, len(rounds)))
+    for user_ids in seeder.iter_id_chunks(conn, "Users", users_per_chunk, after=last_id):
+        stored = {(user_id, round_num): points for user_id, round_num, points in conn.execute(
+            "SELECT UserId, Round, Points FROM UserRoundPoints WHERE UserId BETWEEN ? AND ?",
+            (user_ids[0], user_ids[-1]))}
+        changed = [(points, user_id, round_num) for user_id, round_num, points
+                   in seeder.grouped_user_round_point_rows(conn, user_ids, fantasy_points, rounds)
+                   if stored.get((user_id, round_num), points) != points]
+        conn.executemany("UPDATE UserRoundPoints SET Points = ? WHERE UserId = ? AND Round = ?", changed)
+        yield user_ids[-1], len(changed)
+
+def run_chunks(conn, stage, chunks, checkpoints, config):
+    """Commit every chunk of a stage together with its checkpoint and return the rows changed by the whole stage"""
+    _, row_count, _ = checkpoints.get(stage, (0, 0, False))
+    start = time.perf_counter()
+    for last_id, changed in chunks:
+        row_count += changed
+        seeder.save_checkpoint(conn, JOB, stage, last_id, row_count, config)
+        conn.commit()
+        print(f"  {stage}: committed up to id {last_id}, {row_count} rows changed "
+              f"({time.perf_counter() - start:.1f}s)")
+    return row_count
+
+def rescore(conn, weights, chunk_size=CHUNK_SIZE, restart=False):
+    """Rescore every round point and total with weights, resuming from earlier checkpoints with the same weights.
+
+    Returns stage -> rows changed.
+    """
+    config = json.dumps({"weights": weights}, sort_keys=True)
+    if restart:
+        seeder.clear_checkpoints(conn, JOB)
+    checkpoints = seeder.load_checkpoints(conn, JOB, config)
+    conn.commit()
+    for stage, (last_id, _, _) in checkpoints.items():
+        print(f"Resuming {stage} after id {last_id}")
+    
+    # Score every round that has player or user points
+    last_round = conn.execute("""
+        SELECT MAX(Round) FROM (SELECT MAX(Round) AS Round FROM PlayerRoundPoints
+                                UNION ALL SELECT MAX(Round) FROM UserRoundPoints)
+    """).fetchone()[0] or 0
+    rounds = range(1, last_round + 1)
+    
+    changes = {}
+    last_id, _, _ = checkpoints.get("player_round_points", (0, 0, False))
+    changes["player_round_points"] = run_chunks(
+        conn, "player_round_points", player_round_point_chunks(conn, weights, last_id, chunk_size),
+        checkpoints, config)
+    last_id, _, _ = checkpoints.get("user_round_points", (0, 0, False))
+    changes["user_round_points"] = run_chunks(
+        conn, "user_round_points", user_round_point_chunks(conn, rounds, last_id, chunk_size), checkpoints, config)
+    
+    # Totals and leaderboards are set-based and idempotent, so they run in one last transaction
+    # that also removes the checkpoints
+    changes["total_points"] = seeder.recompute_total_points(conn)
+    if seeder.leaderboards_materialized(conn):
+        changes["leaderboards"] = seeder.materialize_leaderboards(conn, rounds)
+    seeder.clear_checkpoints(conn, JOB)
+    conn.commit()
+    return changes
+
+def weight_entry(value):
+    """argparse type for one name=points pair of --weight"""
+    name, _, points = value.partition("=")
+    if name not in scoring.FANTASY_WEIGHTS:
+        raise argparse.ArgumentTypeError(
+            f"unknown weight {name!r} (choose from {', '.join(scoring.FANTASY_WEIGHTS)})")
+    try:
+        return name, int(points)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"weight of {name} must be a whole number")
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Recompute every fantasy score from the stored player statistics")
+    parser.add_argument("--db", default=seeder.DB_PATH,
+                        help=f"database to rescore (default: {seeder.DB_PATH})")
+    defaults = " ".join(f"{name}={points}" for name, points in scoring.FANTASY_WEIGHTS.items())
+    parser.add_argument("--weight", type=weight_entry, nargs="+", metavar="NAME=POINTS",
+                        help=f"override scoring weights, e.g. steals=3 loss=-2 (default: {defaults})")
+    parser.add_argument("--chunk-size", type=seeder.positive_int, default=CHUNK_SIZE,
+                        help=f"rows rescored per transaction (default: {CHUNK_SIZE})")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore checkpoints of an interrupted run and start from the beginning")
+    parser.add_argument("--no-numpy", action="store_true",
+                        help="score with the scalar Python loop even if NumPy is installed")
+    return parser.parse_args()
+
+def main():
+    """Rescore the database and report what changed"""
+    args = parse_args()
+    seeder.DB_PATH = args.db
+    seeder.USE_NUMPY = seeder.USE_NUMPY and not args.no_numpy
+    weights = {**scoring.FANTASY_WEIGHTS, **dict(args.weight or [])}
+    
+    print(f"Rescoring {seeder.DB_PATH} with weights "
+          f"{', '.join(f'{name}={points}' for name, points in weights.items())}...")
+    print("-" * 50)
+    start = time.perf_counter()
+    conn = seeder.connect()
+    try:
+        changes = rescore(conn, weights, args.chunk_size, args.restart)
+    except KeyboardInterrupt:
+        conn.rollback()
+        sys.exit("⚠️ Interrupted; run again with the same weights to resume from the last checkpoint")
+    except sqlite3.Error as error:
+        conn.rollback()
+        sys.exit(f"❌ {error}; run again to resume from the last checkpoint")
+    finally:
+        conn.close()
+    print("-" * 50)
+    
+    print(f"✅ Rescored in {time.perf_counter() - start:.2f}s")
+    print(f"• {changes['player_round_points']} player round points changed")
+    print(f"• {changes['user_round_points']} user round points changed")
+    print(f"• {changes['total_points']} player and user totals recomputed")
+    if "leaderboards" in changes:
+        print(f"• {changes['leaderboards']} leaderboard and summary rows rebuilt")
+
+if __name__ == "__main__":
+    main()
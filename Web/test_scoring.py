@@ -0,0 +1,40 @@
+"""
+Scoring Parity Tests
+Run with python -m pytest from the Web directory; fails when scoring.py and
+Services/ScoringService.cs disagree, or when the C# rules cannot be read
+"""
+
+import sys
+
+import pytest
+
+import scoring
+
+def test_matches_scoring_service():
+    assert scoring.check_parity(samples=2_000) == []
+
+def test_missing_service_fails(tmp_path):
+    mismatches = scoring.check_parity(samples=10, service_path=str(tmp_path / "ScoringService.cs"))
+    assert any("cannot read the C# rules" in mismatch for mismatch in mismatches)
+
+def test_unparseable_service_fails(tmp_path):
+    service = tmp_path / "ScoringService.cs"
+    service.write_text("public class ScoringService { }\n")
+    mismatches = scoring.check_parity(samples=10, service_path=str(service))
+    assert any("CalculateFantasyPoints not found" in mismatch for mismatch in mismatches)
+
+def test_changed_weight_fails(tmp_path):
+    with open(scoring.SCORING_SERVICE_PATH) as source_file:
+        source = source_file.read()
+    assert "steals * 2" in source
+    service = tmp_path / "ScoringService.cs"
+    service.write_text(source.replace("steals * 2", "steals * 3", 1))
+    mismatches = scoring.check_parity(samples=10, service_path=str(service))
+    assert any(mismatch.startswith("weights") for mismatch in mismatches)
+
+def test_cli_exits_non_zero_without_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["scoring.py", "--samples", "10",
+                                      "--service", str(tmp_path / "ScoringService.cs")])
+    with pytest.raises(SystemExit) as exit_info:
+        scoring.main()
+    assert exit_info.value.code == 1
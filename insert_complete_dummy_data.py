@@ -1,17 +1,231 @@
 #!/usr/bin/env python3
 """
 Complete Fantasy Basketball Dummy Data Script
-Creates comprehensive test data for 5 users across 22 rounds
+Creates comprehensive test data for users, teams, players and rounds
+(100 users across 20 rounds by default, configurable on the command line)
 """
 
+import argparse
+import json
+import os
 import sqlite3
 import hashlib
 import random
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby, islice
+from operator import itemgetter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional, player stats fall back to the scalar generator
+    np = None
+
+import scoring
 
 # Database file path
 DB_PATH = "Web/app.db"
 
+# Number of rows handed to a single executemany() call
+BATCH_SIZE = 5000
+
+# Number of users/players whose rows are generated and written together
+ID_CHUNK_SIZE = 250
+
+# Worker processes generating rows for the single SQLite writer (--workers)
+WORKERS = 1
+
+# Maximum number of validation error messages kept and printed
+VALIDATION_ERROR_SAMPLE = 20
+
+# Seed for reproducible datasets (--seed); each chunk derives its own generator from it
+SEED = None
+
+# Dataset scale (overridable from the command line)
+NUM_USERS = 100
+NUM_TEAMS = 12
+PLAYERS_PER_TEAM = 10
+NUM_ROUNDS = 20
+
+# First round the round-based stages generate; --append-round generates only round NUM_ROUNDS
+FIRST_ROUND = 1
+
+# Generate player stats and score lineups with NumPy when it is installed (disable with --no-numpy)
+USE_NUMPY = np is not None
+
+# Inclusive ranges for generated player statistics, in PlayerRoundPoints column order
+STAT_RANGES = {
+    "points": (0, 35),
+    "rebounds": (0, 15),
+    "assists": (0, 12),
+    "steals": (0, 4),
+    "blocks": (0, 5),
+    "turnovers": (0, 6),
+}
+
+# Password hashing scheme (--password-hash). The app verifies unsalted SHA-256 hex digests;
+# the KDFs cost as much as production-grade auth and are spread over the worker processes
+PASSWORD_SCHEMES = ["sha256", "pbkdf2", "scrypt"]
+PASSWORD_SCHEME = "sha256"
+PBKDF2_ITERATIONS = 600_000
+SCRYPT_PARAMS = {"n": 2**14, "r": 8, "p": 1}
+
+# KDF salts (--password-salt): "shared" hashes each distinct password once, "per-user" salts every user
+PASSWORD_SALTS = ["shared", "per-user"]
+PASSWORD_SALT = "shared"
+
+# Distinct (password, salt) hashes remembered per process
+PASSWORD_CACHE_SIZE = 1024
+
+# How clear_database wipes existing data (--reset): "delete", "drop-indexes" or "template"
+RESET_STRATEGIES = ["delete", "drop-indexes", "template"]
+RESET_STRATEGY = "delete"
+
+# Reset AUTOINCREMENT counters so ids start from 1 on every run (--reset-sequences)
+RESET_SEQUENCES = False
+
+# TotalPoints columns and the round points they sum: table -> (points table, key column, points column)
+TOTAL_POINTS_SOURCES = {
+    "Players": ("PlayerRoundPoints", "PlayerId", "FantasyPoints"),
+    "Users": ("UserRoundPoints", "UserId", "Points"),
+}
+
+# Table each seeding stage fills; its deferred secondary indexes are built right after the stage
+STAGE_TABLES = {
+    "insert_teams": "Teams",
+    "insert_players": "Players",
+    "insert_users": "Users",
+    "insert_user_round_teams": "UserRoundTeams",
+    "insert_fantasy_teams": "FantasyTeams",
+    "insert_player_round_points": "PlayerRoundPoints",
+    "insert_user_round_points": "UserRoundPoints",
+}
+
+# Covering indexes for the seeder's own lookups (and the matching API filters), built after bulk inserts
+# table -> {index name: columns}
+SEEDER_INDEXES = {
+    "FantasyTeams": {"IX_FantasyTeams_UserId_Round_IsActive": ("UserId", "Round", "IsActive", "PlayerId", "IsOnCourt")},
+    "PlayerRoundPoints": {"IX_PlayerRoundPoints_PlayerId_Round": ("PlayerId", "Round", "FantasyPoints")},
+    "UserRoundPoints": {"IX_UserRoundPoints_UserId_Round": ("UserId", "Round", "Points")},
+}
+
+# Drop secondary indexes during a --bulk/--in-memory seed and build them once per loaded table
+# (--keep-indexes disables)
+DEFER_INDEXES = True
+
+# Commit a full seed every COMMIT_EVERY rows (at chunk boundaries) with per-stage checkpoints, so an
+# interrupted run resumes where it stopped (--commit-every); None keeps one transaction per stage
+COMMIT_EVERY = None
+
+# Resume from the checkpoints of an interrupted run with the same settings (--restart starts over)
+RESUME = True
+
+# Job name of the seeding stages in the Checkpoints table
+SEED_JOB = "seed"
+
+# Rows sampled per index by ANALYZE (PRAGMA analysis_limit); 0 analyzes everything
+ANALYSIS_LIMIT = 1000
+
+# Precompute the leaderboard tables on a full seed (--leaderboards). They are an offline artifact:
+# no controller reads them (the API computes leaderboards on every request) and the app does not
+# update them when it writes UserRoundPoints. --append-round and the rescore job keep tables that
+# already hold rows up to date.
+MATERIALIZE_LEADERBOARDS = False
+
+# Precomputed leaderboard tables maintained by materialize_leaderboards (not part of the EF model)
+SUMMARY_TABLES = {
+    "LeaderboardRounds": """
+        CREATE TABLE IF NOT EXISTS LeaderboardRounds (
+            UserId INTEGER NOT NULL,
+            Round INTEGER NOT NULL,
+            Points INTEGER NOT NULL,
+            CumulativePoints INTEGER NOT NULL,
+            Rank INTEGER NOT NULL,
+            CumulativeRank INTEGER NOT NULL,
+            RankChange INTEGER NULL,
+            PRIMARY KEY (UserId, Round)
+        ) WITHOUT ROWID
+    """,
+    "RoundSummaries": """
+        CREATE TABLE IF NOT EXISTS RoundSummaries (
+            Round INTEGER NOT NULL PRIMARY KEY,
+            PlayersScored INTEGER NOT NULL,
+            HighestPlayerScore INTEGER NOT NULL,
+            AveragePlayerScore REAL NOT NULL,
+            UsersScored INTEGER NOT NULL,
+            HighestUserScore INTEGER NOT NULL,
+            AverageUserScore REAL NOT NULL
+        )
+    """,
+    "RoundTopScorers": """
+        CREATE TABLE IF NOT EXISTS RoundTopScorers (
+            Round INTEGER NOT NULL,
+            Kind TEXT NOT NULL,
+            Position INTEGER NOT NULL,
+            EntityId INTEGER NOT NULL,
+            Name TEXT NOT NULL,
+            TeamName TEXT NULL,
+            Points INTEGER NOT NULL,
+            PRIMARY KEY (Round, Kind, Position)
+        ) WITHOUT ROWID
+    """,
+}
+SUMMARY_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS "IX_LeaderboardRounds_Round_Rank" ON LeaderboardRounds (Round, Rank)',
+    'CREATE INDEX IF NOT EXISTS "IX_LeaderboardRounds_Round_CumulativeRank" ON LeaderboardRounds (Round, CumulativeRank)',
+]
+
+# Top players and users kept per round in RoundTopScorers
+ROUND_TOP_SCORERS = 5
+
+# Progress of resumable jobs: the last id committed per job stage and the settings it ran with
+CHECKPOINTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS Checkpoints (
+        Job TEXT NOT NULL,
+        Stage TEXT NOT NULL,
+        LastId INTEGER NOT NULL,
+        RowCount INTEGER NOT NULL,
+        Finished INTEGER NOT NULL DEFAULT 0,
+        Config TEXT NOT NULL,
+        UpdatedAt TEXT NOT NULL,
+        PRIMARY KEY (Job, Stage)
+    )
+"""
+
+# Tables cleared before seeding, in reverse dependency order
+SEEDED_TABLES = [
+    *SUMMARY_TABLES, "CurrentRound", "UserRoundTeams", "UserRoundPoints", "PlayerRoundPoints", 
+    "FantasyTeams", "Players", "Teams", "Users"
+]
+
+# Per-stage metrics output (--metrics PATH, --metrics-format json|prometheus); None disables
+# the statement tracing and SQLite timing, which cost a little on every statement
+METRICS_PATH = None
+METRICS_FORMATS = ["json", "prometheus"]
+METRICS_FORMAT = "json"
+
+# PRAGMAs used while bulk loading
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -262144,  # 256 MB (negative value = KiB)
+    "temp_store": "MEMORY",
+}
+
+# Bulk-load PRAGMAs stored in the database file, restored afterwards; the others end with the connection
+PERSISTENT_PRAGMAS = ["journal_mode"]
+
 # Team names (12 teams)
 TEAMS = [
     "Breidablik", "Fjölnir", "Fylkir", "Hamar", "Haukar", "Hottur",
@@ -82,482 +296,1737 @@ PLAYERS_BY_TEAM = {
     ]
 }
 
-# Generate 100 users
-USERS = []
-for i in range(1, 101):
-    USERS.append({
-        "name": f"User {i}",
-        "email": f"user{i}@fantasy.com", 
-        "password": "user123"
-    })
-
 # Position distribution (2 players per position per team)
 POSITIONS = ["PG", "SG", "SF", "PF", "C"]
 
+# Players in a fantasy lineup: a starter and a bench player per position
+LINEUP_SIZE = 2 * len(POSITIONS)
+
+def generated_rounds():
+    """Round numbers the round-based stages generate"""
+    return range(FIRST_ROUND, NUM_ROUNDS + 1)
+
+def iter_users():
+    """Yield NUM_USERS users"""
+    for i in range(1, NUM_USERS + 1):
+        yield {
+            "name": f"User {i}",
+            "email": f"user{i}@fantasy.com", 
+            "password": "user123"
+        }
+
+def iter_teams():
+    """Yield NUM_TEAMS team names, numbering any teams beyond the named ones"""
+    for i in range(NUM_TEAMS):
+        yield TEAMS[i] if i < len(TEAMS) else f"Team {i + 1}"
+
+def iter_team_players(team_name):
+    """Yield (name, position) for PLAYERS_PER_TEAM players of a team, 2 per position in turn"""
+    names = PLAYERS_BY_TEAM.get(team_name, [])
+    for i in range(PLAYERS_PER_TEAM):
+        name = names[i] if i < len(names) else f"{team_name} Player {i + 1}"
+        yield name, POSITIONS[(i // 2) % len(POSITIONS)]
+
+def position_counts(num_teams, players_per_team):
+    """Number of players each position gets across all teams for the given scale"""
+    counts = dict.fromkeys(POSITIONS, 0)
+    for i in range(players_per_team):
+        counts[POSITIONS[(i // 2) % len(POSITIONS)]] += num_teams
+    return counts
+
 def hash_password(password):
     """Hash password using SHA-256"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-def clear_database():
-    """Clear all existing data"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+@lru_cache(maxsize=PASSWORD_CACHE_SIZE)
+def password_hash(password, salt=None):
+    """Hash password with PASSWORD_SCHEME, memoized per (password, salt).
+
+    KDF hashes are encoded with their parameters and salt, e.g.
+    pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>.
+    """
+    if PASSWORD_SCHEME == "pbkdf2":
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+    if PASSWORD_SCHEME == "scrypt":
+        digest = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+        params = "$".join(str(SCRYPT_PARAMS[name]) for name in ("n", "r", "p"))
+        return f"scrypt${params}${salt.hex()}${digest.hex()}"
+    return hash_password(password)
+
+def password_salts(first_index, count):
+    """KDF salts for count users starting at first_index (None for plain SHA-256)"""
+    if PASSWORD_SCHEME == "sha256":
+        return [None] * count
+    if PASSWORD_SALT == "shared":
+        salt = hashlib.sha256(f"{SEED}:password_salt".encode()).digest()[:16]
+        return [salt] * count
+    rng = chunk_rng("password_salts", first_index)
+    return [rng.getrandbits(128).to_bytes(16, "big") for _ in range(count)]
+
+def hashed_user_rows(task):
+    """Build Users (Name, Email, PasswordHash) rows for a (first_index, users) chunk"""
+    first_index, users = task
+    salts = password_salts(first_index, len(users))
+    return [(user["name"], user["email"], password_hash(user["password"], salt))
+            for user, salt in zip(users, salts)]
+
+# Counters of the stage run_stage is measuring, updated by instrumented connections
+_stage_counters = {"statements": 0, "calls": 0, "sqlite_seconds": 0.0}
+
+# One metrics record per stage run by run_stage
+_stage_reports = []
+
+def count_statement(statement):
+    """sqlite3 trace callback: count every statement SQLite runs (one per executemany row)"""
+    _stage_counters["statements"] += 1
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that adds the time spent in execute/executemany to the stage counters.
+
+    Rows fetched later by iterating the cursor are counted as Python time.
+    """
     
-    # Clear tables in reverse dependency order
-    tables = [
-        "CurrentRound", "UserRoundTeams", "UserRoundPoints", "PlayerRoundPoints", 
-        "FantasyTeams", "Players", "Teams", "Users"
-    ]
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _stage_counters["calls"] += 1
+            _stage_counters["sqlite_seconds"] += time.perf_counter() - start
     
-    for table in tables:
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _stage_counters["calls"] += 1
+            _stage_counters["sqlite_seconds"] += time.perf_counter() - start
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection that counts statements with a trace callback and times SQLite calls"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(count_statement)
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            _stage_counters["sqlite_seconds"] += time.perf_counter() - start
+
+def connect(path=None):
+    """Open DB_PATH (or path), instrumented when per-stage metrics are being collected"""
+    return sqlite3.connect(path or DB_PATH, factory=InstrumentedConnection if METRICS_PATH else sqlite3.Connection)
+
+def apply_bulk_load_pragmas(conn):
+    """Apply BULK_LOAD_PRAGMAS and return the previous values of the persistent ones so they can be restored"""
+    previous = {}
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        if name in PERSISTENT_PRAGMAS:
+            previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+def restore_pragmas(conn, previous):
+    """Restore the persistent PRAGMA values captured by apply_bulk_load_pragmas.
+
+    Changing the journal mode needs the database to itself; while another
+    connection (such as the running app) has it open, the bulk-load value is
+    kept and a warning is printed instead.
+    """
+    for name, value in previous.items():
+        try:
+            conn.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.OperationalError as error:
+            print(f"⚠️ Could not restore PRAGMA {name} = {value} ({error}); "
+                  f"it stays {BULK_LOAD_PRAGMAS[name]}")
+
+@contextmanager
+def bulk_load_connection():
+    """Open a single connection for the whole pipeline with load-time PRAGMAs applied.
+
+    All stages run inside one transaction which is committed on success and
+    rolled back on error. The original journal mode is restored afterwards.
+    """
+    conn = connect()
+    previous = apply_bulk_load_pragmas(conn)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        restore_pragmas(conn, previous)
+        conn.close()
+
+@contextmanager
+def in_memory_connection(keep_data=False):
+    """Open a :memory: copy of the database for the whole pipeline and persist it on success.
+
+    Only the schema and the rows of tables the seeder does not generate (such
+    as the EF migration history) are copied, unless keep_data is set. The live
+    database is written once, by a single backup pass after the pipeline has
+    finished, and is left untouched on error.
+    """
+    live = sqlite3.connect(DB_PATH)
+    try:
+        conn = connect(":memory:")
+        try:
+            if keep_data:
+                live.backup(conn)
+            else:
+                copy_schema(live, conn, [name for object_type, name, _ in schema_objects(live)
+                                         if object_type == "table" and name not in SEEDED_TABLES])
+                conn.commit()
+            yield conn
+            conn.commit()
+            
+            start = time.perf_counter()
+            live.commit()  # The backup target must not be inside a transaction
+            conn.backup(live)
+            print(f"Persisted the in-memory database to {DB_PATH} in {time.perf_counter() - start:.2f}s")
+        finally:
+            conn.close()
+    finally:
+        live.close()
+
+@contextmanager
+def stage_connection(conn=None):
+    """Yield the shared bulk-load connection, or a private one that is committed and closed afterwards"""
+    if conn is not None:
+        yield conn
+        return
+    
+    conn = connect()
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+def iter_chunks(iterable, size):
+    """Yield lists of up to size items from any iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_id_chunks(conn, table, size=ID_CHUNK_SIZE, after=0):
+    """Yield the ids of a table above after in ascending chunks using keyset pagination.
+
+    Only one chunk is held in memory, and no cursor stays open on the table
+    while the caller writes to it.
+    """
+    last_id = after
+    while True:
+        ids = [row[0] for row in conn.execute(
+            f"SELECT Id FROM {table} WHERE Id > ? ORDER BY Id LIMIT ?", (last_id, size))]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+def insert_many(cursor, sql, rows, batch_size=BATCH_SIZE):
+    """Insert rows from any iterable using executemany in batches and return the row count"""
+    count = 0
+    for batch in iter_chunks(rows, batch_size):
+        cursor.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+def load_checkpoints(conn, job, config):
+    """Map stage -> (last committed id, rows so far, finished) for a job's checkpoints with the same config.
+
+    Checkpoints left by a run with other settings are deleted, so the job starts over.
+    """
+    conn.execute(CHECKPOINTS_TABLE)
+    stale = conn.execute("DELETE FROM Checkpoints WHERE Job = ? AND Config != ?", (job, config)).rowcount
+    if stale:
+        print(f"⚠️ Discarded {stale} {job} checkpoints recorded with different settings")
+    rows = conn.execute(
+        "SELECT Stage, LastId, RowCount, Finished FROM Checkpoints WHERE Job = ? ORDER BY rowid", (job,))
+    return {stage: (last_id, row_count, bool(finished)) for stage, last_id, row_count, finished in rows}
+
+def save_checkpoint(conn, job, stage, last_id, row_count, config, finished=False):
+    """Record a stage's progress; commit it together with the chunk it describes"""
+    conn.execute("""
+        INSERT INTO Checkpoints (Job, Stage, LastId, RowCount, Finished, Config, UpdatedAt)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (Job, Stage) DO UPDATE SET
+            LastId = excluded.LastId, RowCount = excluded.RowCount, Finished = excluded.Finished,
+            Config = excluded.Config, UpdatedAt = excluded.UpdatedAt
+    """, (job, stage, last_id, row_count, int(finished), config, datetime.now().isoformat(timespec="seconds")))
+
+def clear_checkpoints(conn, job):
+    """Forget a finished job's progress"""
+    conn.execute(CHECKPOINTS_TABLE)
+    conn.execute("DELETE FROM Checkpoints WHERE Job = ?", (job,))
+
+# Checkpoints of the running --commit-every seed: its "config" and stage -> (last id, rows, finished)
+_seed_checkpoints = {}
+
+def seed_config():
+    """Settings that decide the generated data, stored with the seed checkpoints"""
+    return json.dumps({**worker_config(), "ID_CHUNK_SIZE": ID_CHUNK_SIZE}, sort_keys=True)
+
+def checkpointed_seed():
+    """SEED of an interrupted --commit-every run recorded in DB_PATH, or None"""
+    try:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        return None
+    try:
+        row = conn.execute("SELECT Config FROM Checkpoints WHERE Job = ? LIMIT 1", (SEED_JOB,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        conn.close()
+    return json.loads(row[0])["SEED"] if row else None
+
+class StageProgress:
+    """Chunk progress of one seeding stage under --commit-every.
+
+    track() wraps the stage's chunk source and remembers where each chunk
+    ends; done() is called once per inserted chunk, in the same order, and
+    commits with a checkpoint every COMMIT_EVERY rows. after is the id (or
+    user index) an interrupted run got to. Without checkpoints both pass through.
+    """
+    
+    def __init__(self, conn, stage):
+        self.conn = conn
+        self.stage = stage
+        self.enabled = bool(_seed_checkpoints)
+        self.after, self.rows, _ = _seed_checkpoints.get("stages", {}).get(stage, (0, 0, False))
+        self.ends = deque()
+        self.pending = 0
+    
+    def track(self, chunks, last_id=itemgetter(-1)):
+        """Pass chunks through, noting last_id(chunk) for done()"""
+        if not self.enabled:
+            return chunks
+        return self._tracked(chunks, last_id)
+    
+    def _tracked(self, chunks, last_id):
+        """Generator behind track()"""
+        for chunk in chunks:
+            self.ends.append(last_id(chunk))
+            yield chunk
+    
+    def done(self, rows):
+        """Count an inserted chunk and commit with a checkpoint once COMMIT_EVERY rows are pending"""
+        if not self.enabled:
+            return
+        last_id = self.ends.popleft()
+        self.rows += rows
+        self.pending += rows
+        if self.pending >= COMMIT_EVERY:
+            save_checkpoint(self.conn, SEED_JOB, self.stage, last_id, self.rows, _seed_checkpoints["config"])
+            self.conn.commit()
+            self.pending = 0
+
+def finish_stage(conn, stage, rows):
+    """Mark a stage finished and commit, together with whatever it wrote since its last checkpoint"""
+    _, previous_rows, _ = _seed_checkpoints["stages"].get(stage, (0, 0, False))
+    save_checkpoint(conn, SEED_JOB, stage, 0, previous_rows + rows, _seed_checkpoints["config"], finished=True)
+    conn.commit()
+
+def chunk_rng(stage, first_id):
+    """Random generator for one chunk of a stage.
+
+    Derived from SEED, the chunk's first id and the first generated round, so the generated data does not
+    depend on how chunks are spread over worker processes. Without a SEED the
+    shared random module is used.
+    """
+    if SEED is None:
+        return random
+    if FIRST_ROUND > 1:
+        # Appended rounds must not repeat the generators of round 1
+        return random.Random(f"{SEED}:{stage}:{FIRST_ROUND}:{first_id}")
+    return random.Random(f"{SEED}:{stage}:{first_id}")
+
+def worker_config():
+    """Module settings that worker processes need (spawned workers re-import the module with defaults)"""
+    return {name: globals()[name] for name in
+            ("NUM_USERS", "NUM_TEAMS", "PLAYERS_PER_TEAM", "NUM_ROUNDS", "FIRST_ROUND",
+                                "SEED", "USE_NUMPY", "PASSWORD_SCHEME", "PASSWORD_SALT")}
+
+def init_worker(config, initializer=None, initargs=()):
+    """Apply the parent's settings in a worker process, then run the stage initializer"""
+    globals().update(config)
+    if initializer is not None:
+        initializer(*initargs)
+
+def generate_chunks(generate, chunks, initializer=None, initargs=()):
+    """Yield generate(chunk) for every chunk, in order.
+
+    With WORKERS > 1 the chunks are generated in a process pool while the caller
+    (the only SQLite writer) inserts finished ones; at most 2 * WORKERS results
+    are in flight. initializer(*initargs) sets up per-process state first.
+    """
+    if WORKERS <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield generate(chunk)
+        return
+    
+    with ProcessPoolExecutor(WORKERS, initializer=init_worker,
+                             initargs=(worker_config(), initializer, initargs)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(generate, chunk))
+            if len(pending) >= 2 * WORKERS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_stage(stage, conn=None):
+    """Run a seeding stage and report its throughput and the process peak memory.
+
+    With METRICS_PATH set, also records the statements it ran and the time
+    spent in SQLite calls (on this process's connections) for write_metrics.
+    """
+    _stage_counters.update(statements=0, calls=0, sqlite_seconds=0.0)
+    start = time.perf_counter()
+    rows = stage(conn)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0
+    peak = peak_rss_mb()
+    memory = f", peak RSS {peak:.1f} MB" if peak is not None else ""
+    print(f"  {stage.__name__}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s{memory})")
+    
+    if METRICS_PATH:
+        sqlite_seconds = min(_stage_counters["sqlite_seconds"], elapsed)
+        _stage_reports.append({
+            "stage": stage.__name__,
+            "rows": rows,
+            "seconds": elapsed,
+            "statements": _stage_counters["statements"],
+            "sqlite_calls": _stage_counters["calls"],
+            "sqlite_seconds": sqlite_seconds,
+            "python_seconds": elapsed - sqlite_seconds,
+            "peak_rss_mb": peak,
+        })
+        print(f"    {_stage_counters['statements']} statements in {_stage_counters['calls']} calls, "
+              f"{sqlite_seconds:.2f}s in SQLite, {elapsed - sqlite_seconds:.2f}s in Python")
+    return rows
+
+# Prometheus metric name -> (stage report field, help text)
+PROMETHEUS_METRICS = {
+    "seed_stage_seconds": ("seconds", "Wall time of the seeding stage"),
+    "seed_stage_rows": ("rows", "Rows written by the seeding stage"),
+    "seed_stage_statements": ("statements", "SQL statements run by the seeding stage"),
+    "seed_stage_sqlite_calls": ("sqlite_calls", "execute/executemany calls made by the seeding stage"),
+    "seed_stage_sqlite_seconds": ("sqlite_seconds", "Time the seeding stage spent in SQLite calls"),
+    "seed_stage_python_seconds": ("python_seconds", "Time the seeding stage spent outside SQLite calls"),
+    "seed_stage_peak_rss_megabytes": ("peak_rss_mb", "Process peak resident set size after the seeding stage"),
+}
+
+def prometheus_metrics(reports):
+    """Stage reports in the Prometheus text exposition format"""
+    lines = []
+    for metric, (field, help_text) in PROMETHEUS_METRICS.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for report in reports:
+            if report[field] is not None:
+                lines.append(f'{metric}{{stage="{report["stage"]}"}} {report[field]}')
+    return "\n".join(lines) + "\n"
+
+def write_metrics(run_info):
+    """Write the collected stage reports to METRICS_PATH as JSON or Prometheus text"""
+    with open(METRICS_PATH, "w") as metrics_file:
+        if METRICS_FORMAT == "prometheus":
+            metrics_file.write(prometheus_metrics(_stage_reports))
+        else:
+            json.dump({**run_info, "stages": _stage_reports}, metrics_file, indent=2)
+    print(f"📝 Stage metrics written to {METRICS_PATH}")
+
+def schema_template_path():
+    """Schema-only template used by the "template" reset strategy, kept next to the database"""
+    return os.path.splitext(DB_PATH)[0] + ".schema.db"
+
+def schema_objects(conn):
+    """(type, name, sql) of every user-defined schema object, tables first"""
+    return conn.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+        ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END, name
+    """).fetchall()
+
+def copy_schema(source, target, data_tables=()):
+    """Create every schema object of source in target and copy the rows of data_tables that exist"""
+    objects = schema_objects(source)
+    for _, _, sql in objects:
+        target.execute(sql)
+    tables = {name for object_type, name, _ in objects if object_type == "table"}
+    for table in data_tables:
+        if table in tables:
+            rows = source.execute(f'SELECT * FROM "{table}"')
+            placeholders = ", ".join("?" * len(rows.description))
+            target.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', rows)
+
+def build_schema_template(conn, path):
+    """Write an empty copy of the database schema (keeping the EF migration history) to path"""
+    temp_path = path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    
+    template = sqlite3.connect(temp_path)
+    try:
+        copy_schema(conn, template, ["__EFMigrationsHistory"])
+        template.commit()
+    finally:
+        template.close()
+    os.replace(temp_path, path)
+
+def reset_from_template(conn):
+    """Replace the whole database with the schema-only template via the backup API.
+
+    Rebuilds the template first when it is missing or its schema no longer
+    matches the database. Freed pages, index contents and AUTOINCREMENT
+    counters all go away with the old data.
+    """
+    path = schema_template_path()
+    up_to_date = False
+    if os.path.exists(path):
+        template = sqlite3.connect(path)
+        try:
+            up_to_date = schema_objects(template) == schema_objects(conn)
+        finally:
+            template.close()
+    if not up_to_date:
+        build_schema_template(conn, path)
+        print(f"Built schema template {path}")
+    
+    conn.commit()  # The backup target must not be inside a transaction
+    template = sqlite3.connect(path)
+    try:
+        template.backup(conn)
+    finally:
+        template.close()
+
+def delete_seeded_rows(cursor):
+    """DELETE every seeded table inside the current transaction"""
+    for table in SEEDED_TABLES:
         try:
             cursor.execute(f"DELETE FROM {table}")
             print(f"Cleared {table}")
         except sqlite3.OperationalError:
             print(f"Skipped {table} (table doesn't exist)")
+
+def secondary_indexes(conn, tables, include_unique=True):
+    """(table, name, sql) of the explicitly created indexes on tables"""
+    placeholders = ", ".join("?" for _ in tables)
+    indexes = conn.execute(f"""
+        SELECT tbl_name, name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+    """, list(tables)).fetchall()
+    if include_unique:
+        return indexes
+    return [index for index in indexes if not index[2].upper().startswith("CREATE UNIQUE")]
+
+def clear_database(conn=None):
+    """Clear all existing data using RESET_STRATEGY and report how long it took"""
+    start = time.perf_counter()
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        if RESET_STRATEGY == "template":
+            reset_from_template(conn)
+            print("Reset database from schema template")
+        elif RESET_STRATEGY == "drop-indexes":
+            # Drop secondary indexes so the wipe does not have to maintain them, then recreate them empty
+            indexes = secondary_indexes(conn, SEEDED_TABLES)
+            for _, name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+            delete_seeded_rows(cursor)
+            for _, _, sql in indexes:
+                cursor.execute(sql)
+            print(f"Recreated {len(indexes)} indexes")
+        else:
+            delete_seeded_rows(cursor)
+        
+        if RESET_SEQUENCES and RESET_STRATEGY != "template":
+            placeholders = ", ".join("?" for _ in SEEDED_TABLES)
+            try:
+                cursor.execute(f"DELETE FROM sqlite_sequence WHERE name IN ({placeholders})", SEEDED_TABLES)
+                print("Reset AUTOINCREMENT sequences")
+            except sqlite3.OperationalError:
+                pass  # No AUTOINCREMENT tables, so no sqlite_sequence
     
-    conn.commit()
-    conn.close()
+    print(f"Cleared database using the {RESET_STRATEGY} strategy in {time.perf_counter() - start:.2f}s")
 
-def insert_teams():
+def insert_teams(conn=None):
     """Insert all teams"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    for team_name in TEAMS:
-        cursor.execute("INSERT INTO Teams (Name) VALUES (?)", (team_name,))
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        team_count = insert_many(cursor, "INSERT INTO Teams (Name) VALUES (?)",
+                                 ((team_name,) for team_name in iter_teams()))
     
-    conn.commit()
-    conn.close()
-    print(f"Inserted {len(TEAMS)} teams")
+    print(f"Inserted {team_count} teams")
+    return team_count
 
-def insert_players():
+def insert_players(conn=None):
     """Insert all players with positions and costs"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Get team IDs
-    cursor.execute("SELECT Id, Name FROM Teams")
-    teams = {name: team_id for team_id, name in cursor.fetchall()}
-    
-    player_count = 0
-    for team_name, player_names in PLAYERS_BY_TEAM.items():
-        team_id = teams[team_name]
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
         
-        # Assign 2 players per position (10 players total per team)
-        for i, player_name in enumerate(player_names[:10]):  # Only use first 10 players
-            position = POSITIONS[i // 2]  # 2 players per position
-            cost = random.randint(5, 25)  # Random cost between 5-25
-            
-            cursor.execute("""
-                INSERT INTO Players (TeamId, Name, Position, Cost, TotalPoints)
-                VALUES (?, ?, ?, ?, 0)
-            """, (team_id, player_name, position, cost))
-            
-            player_count += 1
+        # Get team IDs
+        cursor.execute("SELECT Id, Name FROM Teams ORDER BY Id")
+        teams = cursor.fetchall()
+        
+        def player_rows():
+            for team_id, team_name in teams:
+                # Assign 2 players per position
+                for player_name, position in iter_team_players(team_name):
+                    cost = random.randint(5, 25)  # Random cost between 5-25
+                    yield (team_id, player_name, position, cost)
+        
+        player_count = insert_many(cursor, """
+            INSERT INTO Players (TeamId, Name, Position, Cost, TotalPoints)
+            VALUES (?, ?, ?, ?, 0)
+        """, player_rows())
     
-    conn.commit()
-    conn.close()
     print(f"Inserted {player_count} players")
+    return player_count
 
-def insert_users():
+def insert_users(conn=None):
     """Insert all users"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    for user in USERS:
-        password_hash = hash_password(user["password"])
-        cursor.execute("""
-            INSERT INTO Users (Name, Email, PasswordHash, TotalPoints)
-            VALUES (?, ?, ?, 0)
-        """, (user["name"], user["email"], password_hash))
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        progress = StageProgress(conn, "insert_users")
+        tasks = ((progress.after + index * ID_CHUNK_SIZE, users) for index, users
+                 in enumerate(iter_chunks(islice(iter_users(), progress.after, None), ID_CHUNK_SIZE)))
+        # Checkpoints count users by index, since ids are only known after the insert
+        tasks = progress.track(tasks, lambda task: task[0] + len(task[1]))
+        if PASSWORD_SCHEME == "sha256":
+            # Cheap enough that shipping users to worker processes would cost more than hashing them
+            chunks = map(hashed_user_rows, tasks)
+        else:
+            chunks = generate_chunks(hashed_user_rows, tasks)
+        
+        user_count = 0
+        for rows in chunks:
+            user_count += insert_many(cursor, """
+                INSERT INTO Users (Name, Email, PasswordHash, TotalPoints)
+                VALUES (?, ?, ?, 0)
+            """, rows)
+            progress.done(len(rows))
     
-    conn.commit()
-    conn.close()
-    print(f"Inserted {len(USERS)} users")
+    print(f"Inserted {user_count} users")
+    return user_count
 
-def insert_user_round_teams():
-    """Insert UserRoundTeam records for all users and rounds"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Get user IDs
-    cursor.execute("SELECT Id FROM Users")
-    user_ids = [row[0] for row in cursor.fetchall()]
-    
+def user_round_team_rows(user_ids):
+    """Generate UserRoundTeams rows for a chunk of users"""
+    rng = chunk_rng("user_round_teams", user_ids[0])
+    rows = []
     for user_id in user_ids:
-        for round_num in range(1, 21):  # 20 rounds
+        for round_num in generated_rounds():
             # More realistic budget usage (80-100) to ensure we can select 10 players
-            used_budget = random.randint(80, 100)
-            is_locked = random.choice([True, False])  # Random lock status
-            
-            cursor.execute("""
+            used_budget = rng.randint(80, 100)
+            is_locked = rng.choice([True, False])  # Random lock status
+            rows.append((user_id, round_num, used_budget, is_locked))
+    return rows
+
+def insert_user_round_teams(conn=None):
+    """Insert UserRoundTeam records for all users and rounds"""
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        progress = StageProgress(conn, "insert_user_round_teams")
+        user_chunks = progress.track(iter_id_chunks(conn, "Users", after=progress.after))
+        
+        row_count = 0
+        for rows in generate_chunks(user_round_team_rows, user_chunks):
+            row_count += insert_many(cursor, """
                 INSERT INTO UserRoundTeams (UserId, Round, TotalBudget, UsedBudget, IsLocked)
                 VALUES (?, ?, 100, ?, ?)
-            """, (user_id, round_num, used_budget, is_locked))
+            """, rows)
+            progress.done(len(rows))
     
-    conn.commit()
-    conn.close()
     print("Inserted UserRoundTeam records for all users and rounds")
+    return row_count
 
-def insert_fantasy_teams():
-    """Insert fantasy team selections for all users and rounds with budget validation"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+class PlayerCatalog:
+    """The player pool as compact parallel columns, built once per run.
+
+    Row i is player ids[i] with position code positions[i] (an index into
+    POSITIONS) and cost costs[i]. Rows are grouped by position, keeping the
+    query order within a position, so slices[code] is the row range of one
+    position and a lineup can be held as plain row numbers.
+    """
     
-    # Get user IDs
-    cursor.execute("SELECT Id FROM Users")
-    user_ids = [row[0] for row in cursor.fetchall()]
+    __slots__ = ("ids", "positions", "costs", "slices")
     
-    # Get players with their costs and positions
-    cursor.execute("SELECT Id, Position, Cost FROM Players")
-    players_data = cursor.fetchall()
+    def __init__(self, players_data):
+        """Build the columns from (Id, Position, Cost) rows; other positions than POSITIONS are left out"""
+        codes = {position: code for code, position in enumerate(POSITIONS)}
+        rows = sorted((row for row in players_data if row[1] in codes), key=lambda row: codes[row[1]])
+        self.ids = array("i", (player_id for player_id, _, _ in rows))
+        self.positions = array("b", (codes[position] for _, position, _ in rows))
+        self.costs = array("i", (cost for _, _, cost in rows))
+        
+        self.slices = []
+        start = 0
+        for code in range(len(POSITIONS)):
+            stop = start + self.positions.count(code)
+            self.slices.append(range(start, stop))
+            start = stop
+    
+    @classmethod
+    def from_positions(cls, players_by_position):
+        """Build a catalog from a dict of position -> [(player_id, cost)]"""
+        return cls([(player_id, position, cost) for position, players in players_by_position.items()
+                    for player_id, cost in players])
     
-    # Organize players by position
-    players_by_position = {}
-    for player_id, position, cost in players_data:
-        if position not in players_by_position:
-            players_by_position[position] = []
-        players_by_position[position].append((player_id, cost))
+    def __len__(self):
+        """Number of players in the catalog"""
+        return len(self.ids)
+
+def load_budget_index(conn, user_ids):
+    """Map (user_id, round) -> UsedBudget for a chunk of ascending user ids with a single query"""
+    rows = conn.execute("""
+        SELECT UserId, Round, UsedBudget FROM UserRoundTeams
+        WHERE UserId BETWEEN ? AND ?
+    """, (user_ids[0], user_ids[-1]))
+    return {(user_id, round_num): budget for user_id, round_num, budget in rows}
+
+# Per-process state for lineup generation, set up by init_lineup_worker
+_lineup_state = {}
+
+def init_lineup_worker(players_data):
+    """Build the player catalog, lineup optimizer and lineup buffer once per (worker) process"""
+    catalog = PlayerCatalog(players_data)
+    _lineup_state["catalog"] = catalog
+    _lineup_state["optimizer"] = LineupOptimizer(catalog)
+    _lineup_state["lineup"] = array("i", [0]) * LINEUP_SIZE
+
+def fantasy_team_rows(task):
+    """Generate FantasyTeams rows for a (user_ids, budgets) chunk using the process's lineup optimizer"""
+    user_ids, budgets = task
+    player_ids = _lineup_state["catalog"].ids
+    optimizer = _lineup_state["optimizer"]
+    lineup = _lineup_state["lineup"]
+    optimizer.rng = chunk_rng("fantasy_teams", user_ids[0])
     
+    rows = []
     for user_id in user_ids:
-        for round_num in range(1, 21):  # 20 rounds
+        for round_num in generated_rounds():
             # Get the budget for this user/round
-            cursor.execute("""
-                SELECT UsedBudget FROM UserRoundTeams 
-                WHERE UserId = ? AND Round = ?
-            """, (user_id, round_num))
-            result = cursor.fetchone()
-            if not result:
+            budget = budgets.get((user_id, round_num))
+            if budget is None:
                 print(f"Warning: No budget found for user {user_id}, round {round_num}")
                 continue
-            budget = result[0]
-            
-            # Select players within budget
-            selected_players = select_players_within_budget(players_by_position, budget)
-            
-            if len(selected_players) != 10:
-                print(f"Warning: Only selected {len(selected_players)} players for user {user_id}, round {round_num}")
-            
-            # Assign players to court/bench with proper position distribution
-            # Group players by position
-            players_by_position_selected = {}
-            for player_id, cost in selected_players:
-                # Get player position
-                cursor.execute("SELECT Position FROM Players WHERE Id = ?", (player_id,))
-                position = cursor.fetchone()[0]
-                
-                if position not in players_by_position_selected:
-                    players_by_position_selected[position] = []
-                players_by_position_selected[position].append((player_id, cost))
             
-            # Assign first player of each position to court, second to bench
-            for position in POSITIONS:
-                if position in players_by_position_selected:
-                    players = players_by_position_selected[position]
-                    # First player goes to court
-                    cursor.execute("""
-                        INSERT INTO FantasyTeams (UserId, PlayerId, Round, IsActive, IsOnCourt)
-                        VALUES (?, ?, ?, 1, 1)
-                    """, (user_id, players[0][0], round_num))
-                    
-                    # Second player goes to bench
-                    if len(players) > 1:
-                        cursor.execute("""
-                            INSERT INTO FantasyTeams (UserId, PlayerId, Round, IsActive, IsOnCourt)
-                            VALUES (?, ?, ?, 1, 0)
-                        """, (user_id, players[1][0], round_num))
+            # Select players within budget into the reused buffer; the first player of
+            # each position goes to court, the second to the bench
+            optimizer.select_into(budget, lineup)
+            for slot in range(LINEUP_SIZE):
+                rows.append((user_id, player_ids[lineup[slot]], round_num, 1 - slot % 2))
+    return rows
+
+def insert_fantasy_teams(conn=None):
+    """Insert fantasy team selections for all users and rounds with budget validation"""
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        # Get players with their costs and positions
+        cursor.execute("SELECT Id, Position, Cost FROM Players")
+        players_data = cursor.fetchall()
+        
+        progress = StageProgress(conn, "insert_fantasy_teams")
+        tasks = ((user_ids, load_budget_index(conn, user_ids))
+                 for user_ids in progress.track(iter_id_chunks(conn, "Users", after=progress.after)))
+        
+        row_count = 0
+        for rows in generate_chunks(fantasy_team_rows, tasks, init_lineup_worker, (players_data,)):
+            row_count += insert_many(cursor, """
+                INSERT INTO FantasyTeams (UserId, PlayerId, Round, IsActive, IsOnCourt)
+                VALUES (?, ?, ?, 1, ?)
+            """, rows)
+            progress.done(len(rows))
     
-    conn.commit()
-    conn.close()
     print("Inserted fantasy team selections for all users and rounds")
+    return row_count
 
-def select_players_within_budget(players_by_position, budget):
-    """Select 2 players per position (10 total) within the given budget using greedy algorithm"""
-    # First, calculate the minimum possible cost
-    min_cost = 0
-    for position in POSITIONS:
-        available_players = players_by_position[position].copy()
-        cheapest_players = sorted(available_players, key=lambda x: x[1])[:2]
-        min_cost += sum(cost for _, cost in cheapest_players)
-    
-    # If budget is too small, adjust it to minimum cost
-    if budget < min_cost:
-        budget = min_cost
-    
-    # Start with the cheapest possible team
-    selected_players = []
-    for position in POSITIONS:
-        available_players = players_by_position[position].copy()
-        cheapest_players = sorted(available_players, key=lambda x: x[1])[:2]
-        selected_players.extend(cheapest_players)
-    
-    total_cost = sum(cost for _, cost in selected_players)
-    
-    # Now try to upgrade players while staying within budget
-    for position in POSITIONS:
-        available_players = players_by_position[position].copy()
-        random.shuffle(available_players)
+class LineupOptimizer:
+    """Exact lineup selection: 2 players per position with total cost within a budget.
+
+    Maximizes the summed objective value of the lineup (by default the player
+    cost, i.e. spend as much of the budget as possible) with a knapsack DP over
+    integer costs. The per-position pair tables and the DP are built once per
+    player pool, so a query only walks back through the DP. Among equally good
+    choices one is picked at random, so users with the same budget still get
+    varied lineups.
+    """
+    
+    __slots__ = ("rng", "catalog", "pair_tables", "reach", "min_cost", "_best_totals", "_pair_choices")
+    
+    def __init__(self, catalog, values=None, rng=random):
+        """catalog is a PlayerCatalog (or a dict of position -> [(player_id, cost)]), values maps player_id -> objective"""
+        if not isinstance(catalog, PlayerCatalog):
+            catalog = PlayerCatalog.from_positions(catalog)
+        self.rng = rng
+        self.catalog = catalog
+        self.pair_tables = [self._build_pair_table(catalog, code, values) for code in range(len(POSITIONS))]
         
-        # Find current players for this position
-        current_position_players = [p for p in selected_players if any(p[0] == ap[0] for ap in available_players)]
+        # reach[k] maps total cost -> best objective value using the first k positions
+        self.reach = [{0: 0}]
+        for table in self.pair_tables:
+            previous = self.reach[-1]
+            current = {}
+            for spent, value in previous.items():
+                for pair_cost, (pair_value, _) in table.items():
+                    total = spent + pair_cost
+                    if total not in current or value + pair_value > current[total]:
+                        current[total] = value + pair_value
+            self.reach.append(current)
         
-        # Try to upgrade each player in this position
-        for i, current_player in enumerate(current_position_players):
-            if i >= 2:  # Only 2 players per position
-                break
-                
-            # Find a better player that fits in budget
-            for new_player in available_players:
-                if new_player[0] == current_player[0]:  # Skip same player
-                    continue
-                
-                # Check if this player is already selected
-                if any(p[0] == new_player[0] for p in selected_players):
-                    continue
-                
-                # Calculate new total cost if we replace this player
-                new_total_cost = total_cost - current_player[1] + new_player[1]
+        if not self.reach[-1]:
+            raise ValueError("Not enough players to pick 2 per position")
+        self.min_cost = min(self.reach[-1])
+        self._best_totals = {}
+        self._pair_choices = {}
+    
+    @staticmethod
+    def _build_pair_table(catalog, code, values):
+        """Map pair cost -> (best value, [(group_a, group_b), ...]) for one position.
+        
+        Groups are arrays of catalog rows of equally valued players of the same
+        cost; a pair is one player from each group, or two different players
+        when both groups are the same array.
+        """
+        # Group players by cost, then by value (best first)
+        by_cost = {}
+        for row in catalog.slices[code]:
+            cost = catalog.costs[row]
+            value = values[catalog.ids[row]] if values is not None else cost
+            by_cost.setdefault(cost, {}).setdefault(value, array("i")).append(row)
+        classes = {cost: sorted(groups.items(), key=itemgetter(0), reverse=True) for cost, groups in by_cost.items()}
+        
+        table = {}
+        costs = sorted(classes)
+        for i, cost_a in enumerate(costs):
+            for cost_b in costs[i:]:
+                value_a, group_a = classes[cost_a][0]
+                if cost_a != cost_b:
+                    value_b, group_b = classes[cost_b][0]
+                elif len(group_a) > 1:
+                    value_b, group_b = value_a, group_a
+                elif len(classes[cost_a]) > 1:
+                    value_b, group_b = classes[cost_a][1]
+                else:
+                    continue  # only one player at this cost
                 
-                if new_total_cost <= budget:
-                    # Replace the player
-                    selected_players = [p if p[0] != current_player[0] else new_player for p in selected_players]
-                    total_cost = new_total_cost
-                    break
+                pair_cost = cost_a + cost_b
+                pair_value = value_a + value_b
+                best = table.get(pair_cost)
+                if best is None or pair_value > best[0]:
+                    table[pair_cost] = (pair_value, [(group_a, group_b)])
+                elif pair_value == best[0]:
+                    best[1].append((group_a, group_b))
+        return table
+    
+    def best_totals(self, budget):
+        """Total lineup costs within budget that reach the best objective value"""
+        budget = max(budget, self.min_cost)  # Too small budgets get the cheapest lineup
+        totals = self._best_totals.get(budget)
+        if totals is None:
+            final = self.reach[-1]
+            best = max(value for total, value in final.items() if total <= budget)
+            totals = [total for total, value in final.items() if total <= budget and value == best]
+            self._best_totals[budget] = totals
+        return totals
     
-    return selected_players
+    def _choices(self, k, remaining):
+        """Pair costs for position k-1 that lie on an optimal path to reach[k][remaining]"""
+        key = (k, remaining)
+        choices = self._pair_choices.get(key)
+        if choices is None:
+            previous = self.reach[k - 1]
+            target = self.reach[k][remaining]
+            choices = [(pair_cost, recipes)
+                       for pair_cost, (pair_value, recipes) in self.pair_tables[k - 1].items()
+                       if remaining - pair_cost in previous and previous[remaining - pair_cost] + pair_value == target]
+            self._pair_choices[key] = choices
+        return choices
+    
+    def select_into(self, budget, lineup):
+        """Write an optimal lineup into lineup, a LINEUP_SIZE buffer of catalog rows, and return it.
 
-def insert_player_round_points():
-    """Insert player points for all rounds with individual statistics"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+        Slots 2 * code and 2 * code + 1 hold the pair of POSITIONS[code].
+        Nothing is allocated per call, so the buffer can be reused for every
+        lineup.
+        """
+        rng = self.rng
+        choice = rng.choice
+        remaining = choice(self.best_totals(budget))
+        for k in range(len(POSITIONS), 0, -1):
+            pair_cost, recipes = choice(self._choices(k, remaining))
+            group_a, group_b = choice(recipes)
+            slot = 2 * (k - 1)
+            if group_a is group_b:
+                # Two different players of the same group
+                first = rng.randrange(len(group_a))
+                second = rng.randrange(len(group_a) - 1)
+                lineup[slot] = group_a[first]
+                lineup[slot + 1] = group_a[second + (second >= first)]
+            else:
+                lineup[slot] = choice(group_a)
+                lineup[slot + 1] = choice(group_b)
+            remaining -= pair_cost
+        return lineup
     
-    # Get all players
-    cursor.execute("SELECT Id FROM Players")
-    player_ids = [row[0] for row in cursor.fetchall()]
+    def select(self, budget):
+        """Return an optimal lineup as [(player_id, cost)], 2 per position in POSITIONS order"""
+        lineup = self.select_into(budget, array("i", [0]) * LINEUP_SIZE)
+        return [(self.catalog.ids[row], self.catalog.costs[row]) for row in lineup]
     
+    def select_many(self, budgets):
+        """Return a lineup for every budget, e.g. for all users in a round"""
+        return [self.select(budget) for budget in budgets]
+
+def select_players_within_budget(players_by_position, budget):
+    """Select 2 players per position (10 total) within the given budget.
+
+    Convenience wrapper that builds a LineupOptimizer for a single query; build
+    the optimizer once and reuse it when selecting many lineups.
+    """
+    return LineupOptimizer(players_by_position).select(budget)
+
+def scalar_player_round_point_rows(player_ids, rng=random, rounds=None):
+    """Generate PlayerRoundPoints rows one stat at a time for rounds (default: generated_rounds())"""
+    rounds = generated_rounds() if rounds is None else rounds
     for player_id in player_ids:
-        total_fantasy_points = 0
-        for round_num in range(1, 21):  # 20 rounds
+        for round_num in rounds:
             # Generate realistic basketball statistics
-            points = random.randint(0, 35)  # Points scored
-            rebounds = random.randint(0, 15)  # Rebounds
-            assists = random.randint(0, 12)  # Assists
-            steals = random.randint(0, 4)  # Steals
-            blocks = random.randint(0, 5)  # Blocks
-            turnovers = random.randint(0, 6)  # Turnovers
-            team_win = random.choice([True, False])  # Team win/loss
+            points = rng.randint(*STAT_RANGES["points"])  # Points scored
+            rebounds = rng.randint(*STAT_RANGES["rebounds"])  # Rebounds
+            assists = rng.randint(*STAT_RANGES["assists"])  # Assists
+            steals = rng.randint(*STAT_RANGES["steals"])  # Steals
+            blocks = rng.randint(*STAT_RANGES["blocks"])  # Blocks
+            turnovers = rng.randint(*STAT_RANGES["turnovers"])  # Turnovers
+            team_win = rng.choice([True, False])  # Team win/loss
             
             # Calculate fantasy points using the new scoring system
-            fantasy_points = (points + rebounds + assists + 
-                           steals * 2 + blocks * 2 - turnovers + 
-                           (5 if team_win else -3))
-            
-            total_fantasy_points += fantasy_points
+            fantasy_points = scoring.fantasy_points(points, rebounds, assists, steals, blocks,
+                                                    turnovers, team_win)
             
             # Set score as W or L
             score = "W" if team_win else "L"
             
-            cursor.execute("""
+            yield (player_id, round_num, points, rebounds, assists, 
+                   steals, blocks, turnovers, 1 if team_win else 0, fantasy_points, 
+                   score, fantasy_points)
+
+def generate_stat_columns(rng, shape):
+    """Generate every player statistic as an int array of the given (players, rounds) shape"""
+    stats = {name: rng.integers(low, high + 1, size=shape, dtype=np.int32)
+             for name, (low, high) in STAT_RANGES.items()}
+    stats["team_win"] = rng.integers(0, 2, size=shape, dtype=np.int32)
+    return stats
+
+def vectorized_player_round_point_rows(player_ids, rng=random):
+    """Generate PlayerRoundPoints rows for a chunk of players from whole stat columns.
+
+    The NumPy generator is seeded from rng, so a seeded rng keeps both paths reproducible.
+    """
+    generator = np.random.default_rng(rng.getrandbits(64))
+    rounds = generated_rounds()
+    stats = generate_stat_columns(generator, (len(player_ids), len(rounds)))
+    fantasy_points = scoring.fantasy_points_array(stats)
+    
+    # Flatten to one value per row (player-major, matching the scalar generator)
+    player_column = np.repeat(np.asarray(player_ids), len(rounds)).tolist()
+    round_column = np.tile(np.arange(rounds.start, rounds.stop), len(player_ids)).tolist()
+    team_win = stats["team_win"].ravel()
+    fantasy_column = fantasy_points.ravel().tolist()
+    score_column = np.where(team_win == 1, "W", "L").tolist()
+    stat_columns = [stats[name].ravel().tolist() for name in STAT_RANGES]
+    
+    return zip(player_column, round_column, *stat_columns, team_win.tolist(),
+               fantasy_column, score_column, fantasy_column)
+
+def player_round_point_rows(player_ids):
+    """Generate PlayerRoundPoints rows for a chunk of players"""
+    generate = (vectorized_player_round_point_rows if np is not None and USE_NUMPY
+                else scalar_player_round_point_rows)
+    return list(generate(player_ids, chunk_rng("player_round_points", player_ids[0])))
+
+def insert_player_round_points(conn=None):
+    """Insert player points for all rounds with individual statistics"""
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        progress = StageProgress(conn, "insert_player_round_points")
+        player_chunks = progress.track(iter_id_chunks(conn, "Players", after=progress.after))
+        
+        row_count = 0
+        for rows in generate_chunks(player_round_point_rows, player_chunks):
+            row_count += insert_many(cursor, """
                 INSERT INTO PlayerRoundPoints (PlayerId, Round, Points, Rebounds, Assists, 
                                             Steals, Blocks, Turnovers, TeamWin, FantasyPoints, 
                                             Score, TotalPoints)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (player_id, round_num, points, rebounds, assists, 
-                  steals, blocks, turnovers, 1 if team_win else 0, fantasy_points, 
-                  score, fantasy_points))
-        
-        # Update player's total points (using fantasy points)
-        cursor.execute("UPDATE Players SET TotalPoints = ? WHERE Id = ?", (total_fantasy_points, player_id))
+            """, rows)
+            progress.done(len(rows))
     
-    conn.commit()
-    conn.close()
     print("Inserted player round points with individual statistics for all rounds")
+    return row_count
 
-def insert_user_round_points():
-    """Insert user points for all rounds using new scoring system (starters + top 3 bench)"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def load_fantasy_points_index(conn, rounds=None):
+    """Map (player_id, round) -> FantasyPoints for the PlayerRoundPoints of rounds (default: generated_rounds())"""
+    rounds = generated_rounds() if rounds is None else rounds
+    return {(player_id, round_num): fantasy_points for player_id, round_num, fantasy_points in
+            conn.execute("SELECT PlayerId, Round, FantasyPoints FROM PlayerRoundPoints WHERE Round >= ?",
+                         (rounds.start,))}
+
+def grouped_user_round_point_rows(conn, user_ids, fantasy_points, rounds=None):
+    """Score every round in rounds for a chunk of users from one ordered FantasyTeams query.
+
+    rounds defaults to generated_rounds(). Rounds without a complete (LINEUP_SIZE player) team
+    score 0, like the per-round join did. Complete teams are scored together with
+    scoring.team_scores_array when NumPy is available.
+    """
+    rounds = generated_rounds() if rounds is None else rounds
+    team_players = conn.execute("""
+        SELECT UserId, Round, PlayerId, IsOnCourt
+        FROM FantasyTeams
+        WHERE IsActive = 1 AND UserId BETWEEN ? AND ? AND Round >= ?
+        ORDER BY UserId, Round
+    """, (user_ids[0], user_ids[-1], rounds.start))
+    
+    teams = []
+    lineups = []
+    for (user_id, round_num), rows in groupby(team_players, key=itemgetter(0, 1)):
+        lineup = []
+        for _, _, player_id, is_on_court in rows:
+            points = fantasy_points.get((player_id, round_num))
+            if points is not None:
+                lineup.append((points, is_on_court))
+        
+        if len(lineup) == LINEUP_SIZE:  # Ensure we have a complete team
+            teams.append((user_id, round_num))
+            lineups.append(lineup)
     
-    # Get user IDs
-    cursor.execute("SELECT Id FROM Users")
-    user_ids = [row[0] for row in cursor.fetchall()]
+    # All starters + top 3 bench players
+    if np is not None and USE_NUMPY and lineups:
+        lineup_array = np.array(lineups)
+        team_scores = scoring.team_scores_array(lineup_array[:, :, 0], lineup_array[:, :, 1]).tolist()
+    else:
+        team_scores = [scoring.team_score(lineup) for lineup in lineups]
+    scores = dict(zip(teams, team_scores))
     
     for user_id in user_ids:
-        total_points = 0
-        for round_num in range(1, 21):  # 20 rounds
-            # Get all players in the user's fantasy team for this round with their fantasy points
-            cursor.execute("""
-                SELECT ft.IsOnCourt, prp.FantasyPoints
-                FROM FantasyTeams ft
-                JOIN PlayerRoundPoints prp ON ft.PlayerId = prp.PlayerId
-                WHERE ft.UserId = ? AND ft.Round = ? AND ft.IsActive = 1 AND prp.Round = ?
-            """, (user_id, round_num, round_num))
-            
-            team_players = cursor.fetchall()
-            
-            if len(team_players) == 10:  # Ensure we have a complete team
-                # Calculate score: all starters + top 3 bench players
-                starters = [fp for is_on_court, fp in team_players if is_on_court]
-                bench_players = [fp for is_on_court, fp in team_players if not is_on_court]
-                
-                # All starters count
-                round_points = sum(starters)
-                
-                # Top 3 bench players count
-                if len(bench_players) >= 3:
-                    top_3_bench = sorted(bench_players, reverse=True)[:3]
-                    round_points += sum(top_3_bench)
-                else:
-                    round_points += sum(bench_players)  # If less than 3 bench players
-            else:
-                round_points = 0
-            
-            total_points += round_points
-            
-            cursor.execute("""
+        for round_num in rounds:
+            yield (user_id, round_num, scores.get((user_id, round_num), 0))
+
+def insert_user_round_points(conn=None):
+    """Insert user points for all rounds using new scoring system (starters + top 3 bench)"""
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        fantasy_points = load_fantasy_points_index(conn)
+        progress = StageProgress(conn, "insert_user_round_points")
+        
+        row_count = 0
+        for user_ids in progress.track(iter_id_chunks(conn, "Users", after=progress.after)):
+            rows = insert_many(cursor, """
                 INSERT INTO UserRoundPoints (UserId, Round, Points)
                 VALUES (?, ?, ?)
-            """, (user_id, round_num, round_points))
-        
-        # Update user's total points
-        cursor.execute("UPDATE Users SET TotalPoints = ? WHERE Id = ?", (total_points, user_id))
+            """, grouped_user_round_point_rows(conn, user_ids, fantasy_points))
+            row_count += rows
+            progress.done(rows)
     
-    conn.commit()
-    conn.close()
     print("Inserted user round points using new scoring system (starters + top 3 bench)")
+    return row_count
 
-def create_current_round_table():
-    """Create CurrentRound table and set current round to 21"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def add_total_points(conn=None):
+    """Add the generated rounds' points to Players.TotalPoints and Users.TotalPoints.
+
+    One set-based statement per table; totals start at 0 for a full seed and
+    grow by the new round's points for --append-round.
+    """
+    with stage_connection(conn) as conn:
+        row_count = 0
+        for table, (points_table, key_column, points_column) in TOTAL_POINTS_SOURCES.items():
+            row_count += conn.execute(f"""
+                UPDATE {table}
+                SET TotalPoints = TotalPoints + round_totals.Total
+                FROM (SELECT {key_column} AS Id, SUM({points_column}) AS Total
+                      FROM {points_table} WHERE Round >= ? GROUP BY {key_column}) AS round_totals
+                WHERE round_totals.Id = {table}.Id
+            """, (FIRST_ROUND,)).rowcount
     
-    # Create CurrentRound table if it doesn't exist
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS CurrentRound (
-            Id INTEGER PRIMARY KEY AUTOINCREMENT,
-            RoundNumber INTEGER NOT NULL
-        )
-    """)
+    print("Updated player and user total points")
+    return row_count
+
+def recompute_total_points(conn=None):
+    """Recompute Players.TotalPoints and Users.TotalPoints from all round points, one statement per table"""
+    with stage_connection(conn) as conn:
+        row_count = 0
+        for table, (points_table, key_column, points_column) in TOTAL_POINTS_SOURCES.items():
+            row_count += conn.execute(f"""
+                UPDATE {table}
+                SET TotalPoints = COALESCE((SELECT SUM({points_column}) FROM {points_table}
+                                            WHERE {key_column} = {table}.Id), 0)
+            """).rowcount
+    
+    print("Recomputed player and user total points from round points")
+    return row_count
+
+def total_points_drift(conn=None):
+    """Report rows whose stored TotalPoints differ from their summed round points without changing anything.
+
+    Returns table -> {"rows": drifting row count, "points": summed absolute
+    drift, "sample": up to VALIDATION_ERROR_SAMPLE (id, stored, summed) tuples}.
+    """
+    report = {}
+    with stage_connection(conn) as conn:
+        for table, (points_table, key_column, points_column) in TOTAL_POINTS_SOURCES.items():
+            drift_query = f"""
+                SELECT t.Id, t.TotalPoints, COALESCE(round_totals.Total, 0) AS Summed
+                FROM {table} t
+                LEFT JOIN (SELECT {key_column} AS Id, SUM({points_column}) AS Total
+                           FROM {points_table} GROUP BY {key_column}) AS round_totals
+                    ON round_totals.Id = t.Id
+                WHERE t.TotalPoints IS NOT COALESCE(round_totals.Total, 0)
+            """
+            rows, points = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(ABS(TotalPoints - Summed)), 0) FROM ({drift_query})").fetchone()
+            sample = conn.execute(f"{drift_query} ORDER BY t.Id LIMIT ?", (VALIDATION_ERROR_SAMPLE,)).fetchall()
+            report[table] = {"rows": rows, "points": points, "sample": sample}
     
-    # Clear any existing data and insert current round
-    cursor.execute("DELETE FROM CurrentRound")
-    cursor.execute("INSERT INTO CurrentRound (RoundNumber) VALUES (21)")
+    for table, drift in report.items():
+        if drift["rows"]:
+            print(f"❌ {table}: {drift['rows']} rows drifted by {drift['points']} points in total")
+            for row_id, stored, summed in drift["sample"]:
+                print(f"  • {table} {row_id}: stored {stored}, round points sum to {summed}")
+        else:
+            print(f"✅ {table}: all TotalPoints match their round points")
+    return report
+
+def create_summary_tables(conn, tables=SUMMARY_TABLES):
+    """Create the leaderboard and round summary tables (default: all of them) and their lookup indexes if missing"""
+    for table in tables:
+        conn.execute(SUMMARY_TABLES[table])
+    for sql in SUMMARY_INDEXES:
+        if any(f" ON {table} (" in sql for table in tables):
+            conn.execute(sql)
+
+def rebuild_leaderboard(conn):
+    """Fill a new LeaderboardRounds for every round with one windowed statement, indexing it afterwards"""
+    conn.execute(SUMMARY_TABLES["LeaderboardRounds"])
+    row_count = conn.execute("""
+        INSERT INTO LeaderboardRounds (UserId, Round, Points, CumulativePoints, Rank, CumulativeRank, RankChange)
+        SELECT UserId, Round, Points, CumulativePoints,
+               RANK() OVER (PARTITION BY Round ORDER BY Points DESC),
+               CumulativeRank,
+               LAG(CumulativeRank) OVER (PARTITION BY UserId ORDER BY Round) - CumulativeRank
+        FROM (
+            SELECT *, RANK() OVER (PARTITION BY Round ORDER BY CumulativePoints DESC) AS CumulativeRank
+            FROM (
+                SELECT UserId, Round, Points,
+                       SUM(Points) OVER (PARTITION BY UserId ORDER BY Round) AS CumulativePoints
+                FROM UserRoundPoints
+            )
+        )
+    """).rowcount
+    create_summary_tables(conn)
+    return row_count
+
+def append_leaderboard_round(conn, round_num):
+    """Add one round to LeaderboardRounds from UserRoundPoints and the previous round's cumulative standings"""
+    conn.execute("DELETE FROM LeaderboardRounds WHERE Round = ?", (round_num,))
+    return conn.execute("""
+        INSERT INTO LeaderboardRounds (UserId, Round, Points, CumulativePoints, Rank, CumulativeRank, RankChange)
+        SELECT UserId, Round, Points, CumulativePoints,
+               RANK() OVER (ORDER BY Points DESC),
+               RANK() OVER (ORDER BY CumulativePoints DESC),
+               PreviousRank - RANK() OVER (ORDER BY CumulativePoints DESC)
+        FROM (
+            SELECT urp.UserId, urp.Round, urp.Points,
+                   urp.Points + COALESCE(previous.CumulativePoints, 0) AS CumulativePoints,
+                   previous.CumulativeRank AS PreviousRank
+            FROM UserRoundPoints urp
+            LEFT JOIN LeaderboardRounds previous
+                ON previous.UserId = urp.UserId AND previous.Round = urp.Round - 1
+            WHERE urp.Round = ?
+        )
+    """, (round_num,)).rowcount
+
+def refresh_round_summaries(conn, first_round):
+    """Recompute RoundSummaries and RoundTopScorers for first_round onwards"""
+    conn.execute("DELETE FROM RoundSummaries WHERE Round >= ?", (first_round,))
+    row_count = conn.execute("""
+        INSERT INTO RoundSummaries (Round, PlayersScored, HighestPlayerScore, AveragePlayerScore,
+                                    UsersScored, HighestUserScore, AverageUserScore)
+        SELECT players.Round, players.Scored, players.Highest, players.Average,
+               COALESCE(users.Scored, 0), COALESCE(users.Highest, 0), COALESCE(users.Average, 0.0)
+        FROM (SELECT Round, COUNT(*) AS Scored, MAX(TotalPoints) AS Highest, AVG(TotalPoints) AS Average
+              FROM PlayerRoundPoints WHERE Round >= ? GROUP BY Round) AS players
+        LEFT JOIN (SELECT Round, COUNT(*) AS Scored, MAX(Points) AS Highest, AVG(Points) AS Average
+                   FROM LeaderboardRounds WHERE Round >= ? GROUP BY Round) AS users
+            ON users.Round = players.Round
+    """, (first_round, first_round)).rowcount
     
-    conn.commit()
-    conn.close()
-    print("Created CurrentRound table and set current round to 21")
+    conn.execute("DELETE FROM RoundTopScorers WHERE Round >= ?", (first_round,))
+    row_count += conn.execute("""
+        INSERT INTO RoundTopScorers (Round, Kind, Position, EntityId, Name, TeamName, Points)
+        SELECT Round, 'player', Position, PlayerId, Name, TeamName, Points
+        FROM (
+            SELECT prp.Round, prp.PlayerId, p.Name, COALESCE(t.Name, 'Unknown') AS TeamName, prp.TotalPoints AS Points,
+                   ROW_NUMBER() OVER (PARTITION BY prp.Round ORDER BY prp.TotalPoints DESC, prp.PlayerId) AS Position
+            FROM PlayerRoundPoints prp
+            JOIN Players p ON p.Id = prp.PlayerId
+            LEFT JOIN Teams t ON t.Id = p.TeamId
+            WHERE prp.Round >= ?
+        )
+        WHERE Position <= ?
+    """, (first_round, ROUND_TOP_SCORERS)).rowcount
+    row_count += conn.execute("""
+        INSERT INTO RoundTopScorers (Round, Kind, Position, EntityId, Name, TeamName, Points)
+        SELECT Round, 'user', Position, UserId, Name, NULL, Points
+        FROM (
+            SELECT lr.Round, lr.UserId, u.Name, lr.Points,
+                   ROW_NUMBER() OVER (PARTITION BY lr.Round ORDER BY lr.Points DESC, lr.UserId) AS Position
+            FROM LeaderboardRounds lr
+            JOIN Users u ON u.Id = lr.UserId
+            WHERE lr.Round >= ? AND lr.Rank <= ?
+        )
+        WHERE Position <= ?
+    """, (first_round, ROUND_TOP_SCORERS, ROUND_TOP_SCORERS)).rowcount
+    return row_count
+
+def leaderboards_materialized(conn):
+    """Whether LeaderboardRounds holds rows, i.e. an earlier run materialized the leaderboards"""
+    try:
+        return conn.execute("SELECT 1 FROM LeaderboardRounds LIMIT 1").fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+def materialize_leaderboards(conn=None, rounds=None):
+    """Precompute per-round ranks, cumulative standings, rank movement and top scorers for rounds (offline only).
 
-def validate_fantasy_teams():
-    """Validate that all fantasy teams have valid players and don't exceed budget"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    rounds defaults to generated_rounds(). Rounds starting at 1 (a full seed)
+    rebuild the tables in one pass; later rounds (--append-round) are added
+    one by one, ranked against the previous round's cumulative standings.
+    """
+    rounds = generated_rounds() if rounds is None else rounds
+    with stage_connection(conn) as conn:
+        if rounds.start == 1:
+            for table in SUMMARY_TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            row_count = rebuild_leaderboard(conn)
+        else:
+            create_summary_tables(conn)
+            row_count = sum(append_leaderboard_round(conn, round_num) for round_num in rounds)
+        row_count += refresh_round_summaries(conn, rounds.start)
     
-    print("\n🔍 Validating fantasy teams...")
+    print("Materialized leaderboards and round summaries")
+    return row_count
+
+def create_current_round_table(conn=None):
+    """Create CurrentRound table and set current round to the round after the last seeded one"""
+    current_round = NUM_ROUNDS + 1
+    with stage_connection(conn) as conn:
+        cursor = conn.cursor()
+        
+        # Create CurrentRound table if it doesn't exist
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS CurrentRound (
+                Id INTEGER PRIMARY KEY AUTOINCREMENT,
+                RoundNumber INTEGER NOT NULL
+            )
+        """)
+        
+        # Clear any existing data and insert current round
+        cursor.execute("DELETE FROM CurrentRound")
+        cursor.execute("INSERT INTO CurrentRound (RoundNumber) VALUES (?)", (current_round,))
     
-    # Get all fantasy teams with their costs
-    cursor.execute("""
-        SELECT ft.UserId, ft.Round, ft.PlayerId, p.Cost, p.Name, p.Position
+    print(f"Created CurrentRound table and set current round to {current_round}")
+    return 1
+
+# Per-process state for validation, set up by init_validation_worker
+_validation_state = {}
+
+def init_validation_worker(db_path):
+    """Open one read-only connection per (worker) process for validation"""
+    _validation_state["conn"] = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+def new_validation_summary():
+    """Counters for a validation pass; errors holds at most VALIDATION_ERROR_SAMPLE messages"""
+    return {"teams": 0, "player_count_errors": 0, "position_errors": 0,
+            "budget_errors": 0, "error_count": 0, "errors": []}
+
+def add_validation_error(summary, kind, message):
+    """Count an error and keep its message if the sample is not full yet"""
+    summary[kind] += 1
+    summary["error_count"] += 1
+    if len(summary["errors"]) < VALIDATION_ERROR_SAMPLE:
+        summary["errors"].append(message)
+
+def merge_validation_summaries(total, summary):
+    """Add a key range's counters and error sample into the running total"""
+    for key, value in summary.items():
+        if key == "errors":
+            total[key].extend(value[:VALIDATION_ERROR_SAMPLE - len(total[key])])
+        else:
+            total[key] += value
+    return total
+
+def validate_user_range(user_range):
+    """Validate the active fantasy teams of users first_id..last_id in one ordered pass"""
+    first_id, last_id = user_range
+    rows = _validation_state["conn"].execute("""
+        SELECT ft.UserId, ft.Round, p.Position, p.Cost, urt.UsedBudget
         FROM FantasyTeams ft
         JOIN Players p ON ft.PlayerId = p.Id
-        WHERE ft.IsActive = 1
-        ORDER BY ft.UserId, ft.Round, ft.PlayerId
-    """)
-    
-    fantasy_teams = cursor.fetchall()
-    
-    # Group by user and round
-    user_round_teams = {}
-    for user_id, round_num, player_id, cost, name, position in fantasy_teams:
-        key = (user_id, round_num)
-        if key not in user_round_teams:
-            user_round_teams[key] = []
-        user_round_teams[key].append((player_id, cost, name, position))
-    
-    # Validate each user/round combination
-    validation_errors = []
-    for (user_id, round_num), players in user_round_teams.items():
-        # Check if we have exactly 10 players
-        if len(players) != 10:
-            validation_errors.append(f"User {user_id}, Round {round_num}: Expected 10 players, got {len(players)}")
-        
-        # Check position distribution (2 per position)
+        LEFT JOIN UserRoundTeams urt ON urt.UserId = ft.UserId AND urt.Round = ft.Round
+        WHERE ft.IsActive = 1 AND ft.UserId BETWEEN ? AND ?
+        ORDER BY ft.UserId, ft.Round
+    """, (first_id, last_id))
+    
+    summary = new_validation_summary()
+    for (user_id, round_num), players in groupby(rows, key=itemgetter(0, 1)):
+        summary["teams"] += 1
+        player_count = 0
+        total_cost = 0
+        budget = None
         position_counts = {}
-        for player_id, cost, name, position in players:
+        for _, _, position, cost, budget in players:
+            player_count += 1
+            total_cost += cost
             position_counts[position] = position_counts.get(position, 0) + 1
         
+        # Check if we have exactly LINEUP_SIZE players
+        if player_count != LINEUP_SIZE:
+            add_validation_error(summary, "player_count_errors",
+                                 f"User {user_id}, Round {round_num}: Expected {LINEUP_SIZE} players, got {player_count}")
+        
+        # Check position distribution (2 per position)
         for position in POSITIONS:
             if position_counts.get(position, 0) != 2:
-                validation_errors.append(f"User {user_id}, Round {round_num}: Expected 2 {position} players, got {position_counts.get(position, 0)}")
+                add_validation_error(summary, "position_errors",
+                                     f"User {user_id}, Round {round_num}: Expected 2 {position} players, got {position_counts.get(position, 0)}")
         
         # Check total cost vs budget
-        total_cost = sum(cost for player_id, cost, name, position in players)
-        cursor.execute("""
-            SELECT UsedBudget FROM UserRoundTeams 
-            WHERE UserId = ? AND Round = ?
-        """, (user_id, round_num))
-        result = cursor.fetchone()
-        if result:
-            budget = result[0]
-            if total_cost > budget:
-                validation_errors.append(f"User {user_id}, Round {round_num}: Total cost {total_cost} exceeds budget {budget}")
-    
-    conn.close()
-    
-    if validation_errors:
-        print("❌ Validation errors found:")
-        for error in validation_errors:
+        if budget is not None and total_cost > budget:
+            add_validation_error(summary, "budget_errors",
+                                 f"User {user_id}, Round {round_num}: Total cost {total_cost} exceeds budget {budget}")
+    return summary
+
+def iter_user_ranges(conn):
+    """Yield (first_id, last_id) ranges of user ids for splitting work across processes"""
+    for user_ids in iter_id_chunks(conn, "Users"):
+        yield user_ids[0], user_ids[-1]
+
+def validate_fantasy_teams(conn=None):
+    """Validate that all fantasy teams have valid players and don't exceed budget.
+
+    Streams one ordered join per range of user ids, so memory stays constant
+    however many users and rounds there are; with WORKERS > 1 the ranges are
+    checked in a process pool. A given connection (which other processes may
+    not be able to see, e.g. :memory:) is validated serially. Returns the
+    summary counters with a sample of at most VALIDATION_ERROR_SAMPLE error messages.
+    """
+    print("\n🔍 Validating fantasy teams...")
+    
+    summary = new_validation_summary()
+    with stage_connection(conn) as range_conn:
+        ranges = iter_user_ranges(range_conn)
+        if conn is not None:
+            _validation_state["conn"] = conn
+            range_summaries = map(validate_user_range, ranges)
+        else:
+            range_summaries = generate_chunks(validate_user_range, ranges, init_validation_worker, (DB_PATH,))
+        try:
+            for range_summary in range_summaries:
+                merge_validation_summaries(summary, range_summary)
+        finally:
+            # Serial runs keep the validation connection in this process
+            validation_conn = _validation_state.pop("conn", None)
+            if validation_conn is not None and validation_conn is not conn:
+                validation_conn.close()
+    
+    if summary["error_count"]:
+        print(f"❌ {summary['error_count']} validation errors found in {summary['teams']} user/round combinations:")
+        print(f"  • {summary['player_count_errors']} wrong player counts")
+        print(f"  • {summary['position_errors']} wrong position distributions")
+        print(f"  • {summary['budget_errors']} teams over budget")
+        print(f"First {len(summary['errors'])} errors:")
+        for error in summary["errors"]:
             print(f"  • {error}")
-        return False
     else:
         print("✅ All fantasy teams are valid!")
-        print(f"  • {len(user_round_teams)} user/round combinations validated")
-        print(f"  • All teams have exactly 10 players")
+        print(f"  • {summary['teams']} user/round combinations validated")
+        print(f"  • All teams have exactly {LINEUP_SIZE} players")
         print(f"  • All teams have correct position distribution (2 per position)")
         print(f"  • All teams are within budget")
-        return True
+    return summary
+
+def missing_seeder_indexes(conn):
+    """table -> CREATE INDEX statements for the SEEDER_INDEXES the database does not have yet"""
+    existing = {name for _, name, _ in secondary_indexes(conn, SEEDER_INDEXES)}
+    statements = {}
+    for table, indexes in SEEDER_INDEXES.items():
+        for name, columns in indexes.items():
+            if name not in existing:
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                statements.setdefault(table, []).append(f'CREATE INDEX "{name}" ON "{table}" ({column_list})')
+    return statements
+
+def defer_indexes(conn=None):
+    """Drop the non-unique secondary indexes of the tables the stages fill.
+
+    Returns table -> CREATE INDEX statements (the dropped ones plus missing
+    SEEDER_INDEXES) for build_indexes to run once the table is loaded. Unique
+    indexes stay, since they enforce constraints and the stages read through
+    IX_UserRoundTeams_UserId_Round.
+    """
+    with stage_connection(conn) as conn:
+        deferred = missing_seeder_indexes(conn)
+        indexes = secondary_indexes(conn, STAGE_TABLES.values(), include_unique=False)
+        for table, name, sql in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+            deferred.setdefault(table, []).insert(0, sql)
+    
+    print(f"Deferred {len(indexes)} secondary indexes until their tables are loaded")
+    return deferred
+
+def build_indexes(conn, table, statements):
+    """Create table's (deferred) indexes in one pass over the loaded rows"""
+    if not statements:
+        return
+    start = time.perf_counter()
+    with stage_connection(conn) as conn:
+        for sql in statements:
+            conn.execute(sql)
+    print(f"  Built {len(statements)} indexes on {table} in {time.perf_counter() - start:.2f}s")
+
+def analyze_database(conn=None):
+    """Refresh the query planner statistics: ANALYZE after a full seed, PRAGMA optimize after an append"""
+    with stage_connection(conn) as conn:
+        conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        conn.execute("ANALYZE" if FIRST_ROUND == 1 else "PRAGMA optimize")
+        row_count = conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]
+    
+    print("Analyzed the database for the query planner")
+    return row_count
+
+def resume_seed_checkpoints(conn):
+    """Set up checkpoints for a --commit-every seed and return whether an interrupted run is being resumed"""
+    config = seed_config()
+    if not RESUME:
+        clear_checkpoints(conn, SEED_JOB)
+    _seed_checkpoints.update(config=config, stages=load_checkpoints(conn, SEED_JOB, config))
+    for stage, (last_id, row_count, finished) in _seed_checkpoints["stages"].items():
+        if finished:
+            print(f"Resuming: {stage} already finished ({row_count} rows)")
+        else:
+            print(f"Resuming: {stage} continues after {last_id} ({row_count} rows committed)")
+    return bool(_seed_checkpoints["stages"])
+
+def seed_database(conn=None):
+    """Run every seeding stage in dependency order.
+
+    With COMMIT_EVERY set, the stages share one connection that commits every
+    COMMIT_EVERY rows with a checkpoint, and a rerun with the same settings
+    resumes after the last commit instead of clearing the database.
+    """
+    if COMMIT_EVERY and conn is None:
+        with stage_connection() as conn:
+            seed_database(conn)
+        return
+    
+    # Clear existing data, unless an interrupted run is picked up where it stopped
+    if not (COMMIT_EVERY and resume_seed_checkpoints(conn)):
+        clear_database(conn)
+        if COMMIT_EVERY:
+            conn.execute(CHECKPOINTS_TABLE)  # A template reset drops it
+    
+    # Secondary indexes are built once each table is loaded instead of on every insert. Only a run in
+    # one transaction (--bulk/--in-memory) may drop them: anything committed before the rebuild, like
+    # the per-stage commits of the default mode or checkpointed runs, would leave the database
+    # without them if the run is killed.
+    if DEFER_INDEXES and conn is not None and not COMMIT_EVERY:
+        deferred = defer_indexes(conn)
+    else:
+        with stage_connection(conn) as index_conn:
+            deferred = missing_seeder_indexes(index_conn)
+    
+    # Insert data in dependency order
+    try:
+        for stage in (insert_teams, insert_players, insert_users, insert_user_round_teams,
+                      insert_fantasy_teams, insert_player_round_points, insert_user_round_points,
+                      add_total_points, materialize_leaderboards, create_current_round_table,
+                      analyze_database):
+            if stage is materialize_leaderboards and not MATERIALIZE_LEADERBOARDS:
+                continue
+            if COMMIT_EVERY and _seed_checkpoints["stages"].get(stage.__name__, (0, 0, False))[2]:
+                continue
+            rows = run_stage(stage, conn)
+            table = STAGE_TABLES.get(stage.__name__)
+            if table is not None:
+                build_indexes(conn, table, deferred.pop(table, []))
+            if COMMIT_EVERY:
+                finish_stage(conn, stage.__name__, rows)
+        if COMMIT_EVERY:
+            clear_checkpoints(conn, SEED_JOB)
+    finally:
+        # Never leave the database without its indexes if a stage fails
+        for table, statements in deferred.items():
+            build_indexes(conn, table, statements)
+        _seed_checkpoints.clear()
+
+def round_to_append():
+    """Round that --append-round generates: the stored current round, which must not have data yet"""
+    with stage_connection() as conn:
+        try:
+            row = conn.execute("SELECT RoundNumber FROM CurrentRound ORDER BY Id DESC LIMIT 1").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is None:
+            raise ValueError("No current round found; seed the database before appending rounds")
+        round_num = row[0]
+        
+        if conn.execute("SELECT 1 FROM UserRoundTeams WHERE Round >= ? LIMIT 1", (round_num,)).fetchone():
+            raise ValueError(f"Round {round_num} already has data")
+        if not conn.execute("SELECT 1 FROM Users LIMIT 1").fetchone():
+            raise ValueError("No users found; seed the database before appending rounds")
+    return round_num
+
+def append_round(conn=None):
+    """Generate round FIRST_ROUND..NUM_ROUNDS on top of the existing data and advance the current round.
+
+    Totals are increased by the new round's points instead of being recomputed.
+    """
+    # The tables are already large, so indexes are kept; only missing covering indexes are built
+    with stage_connection(conn) as index_conn:
+        missing = missing_seeder_indexes(index_conn)
+        # Leaderboards materialized by an earlier run get the new round as well
+        leaderboards = leaderboards_materialized(index_conn)
+    for table, statements in missing.items():
+        build_indexes(conn, table, statements)
+    
+    for stage in (insert_user_round_teams, insert_fantasy_teams, insert_player_round_points,
+                  insert_user_round_points, add_total_points, materialize_leaderboards,
+                  create_current_round_table, analyze_database):
+        if stage is materialize_leaderboards and not leaderboards:
+            continue
+        run_stage(stage, conn)
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Populate the database with fantasy basketball dummy data")
+    parser.add_argument("--bulk", action="store_true",
+                        help="share one connection and transaction across all stages with load-time PRAGMAs")
+    parser.add_argument("--no-numpy", action="store_true",
+                        help="generate player stats and score lineups with the scalar Python loops "
+                             "even if NumPy is installed")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="generate everything in a :memory: copy of the schema and write it over the "
+                             "database in one backup pass at the end (ids start from 1; needs RAM for the dataset)")
+    parser.add_argument("--keep-indexes", action="store_true",
+                        help="with --bulk or --in-memory, keep secondary indexes while inserting instead of "
+                             "building them after each table is loaded")
+    parser.add_argument("--leaderboards", action="store_true",
+                        help="also precompute the LeaderboardRounds, RoundSummaries and RoundTopScorers tables "
+                             "as an offline artifact: the API does not read them and still computes leaderboards "
+                             "on every request, and they go stale once the app scores a round; "
+                             "--append-round and rescore_points.py update them once they exist")
+    parser.add_argument("--reset", choices=RESET_STRATEGIES, default=RESET_STRATEGY,
+                        help="how existing data is wiped: DELETE in one transaction, DELETE with secondary "
+                             "indexes dropped and recreated, or restore a schema-only template "
+                             f"(wipes every table; default: {RESET_STRATEGY})")
+    parser.add_argument("--reset-sequences", action="store_true",
+                        help="reset AUTOINCREMENT counters so ids start from 1 (always true for --reset template)")
+    parser.add_argument("--commit-every", type=positive_int, metavar="ROWS",
+                        help="commit a full seed about every ROWS rows and checkpoint each stage, so rerunning "
+                             "an interrupted seed with the same options resumes where it stopped (its seed is "
+                             "reused); secondary indexes are kept while inserting")
+    parser.add_argument("--restart", action="store_true",
+                        help="with --commit-every, ignore the checkpoints of an interrupted run and start over")
+    parser.add_argument("--append-round", action="store_true",
+                        help="keep the existing data and generate one more round (the current round), "
+                             "then advance the current round; scale options are ignored")
+    parser.add_argument("--totals", choices=["recompute", "verify"],
+                        help="only maintain Players/Users TotalPoints: recompute them from the round points, "
+                             "or report drift without changing anything (exits with 1 on drift)")
+    parser.add_argument("--password-hash", choices=PASSWORD_SCHEMES, default=PASSWORD_SCHEME,
+                        help="how user passwords are hashed; only sha256 can log in to the app, the KDFs "
+                             f"(PBKDF2-SHA256, scrypt) reproduce production hashing cost (default: {PASSWORD_SCHEME})")
+    parser.add_argument("--password-salt", choices=PASSWORD_SALTS, default=PASSWORD_SALT,
+                        help="KDF salt: one shared salt so each distinct password is hashed once, "
+                             f"or a random salt per user (default: {PASSWORD_SALT})")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="write per-stage wall time, rows, SQL statement counts and SQLite/Python time to PATH "
+                             "(statements run in worker processes are not counted)")
+    parser.add_argument("--metrics-format", choices=METRICS_FORMATS, default=METRICS_FORMAT,
+                        help=f"format of the --metrics file (default: {METRICS_FORMAT})")
+    parser.add_argument("--workers", type=positive_int, default=WORKERS,
+                        help=f"worker processes generating rows for the single database writer (default: {WORKERS})")
+    parser.add_argument("--seed", type=int,
+                        help="seed for a reproducible dataset (default: random, printed at start)")
+    parser.add_argument("--users", type=positive_int, default=NUM_USERS,
+                        help=f"number of regular users to create (default: {NUM_USERS})")
+    parser.add_argument("--teams", type=positive_int, default=NUM_TEAMS,
+                        help=f"number of teams to create (default: {NUM_TEAMS})")
+    parser.add_argument("--players-per-team", type=positive_int, default=PLAYERS_PER_TEAM,
+                        help=f"number of players per team (default: {PLAYERS_PER_TEAM})")
+    parser.add_argument("--rounds", type=positive_int, default=NUM_ROUNDS,
+                        help=f"number of historical rounds to create (default: {NUM_ROUNDS})")
+    args = parser.parse_args()
+    
+    # Every lineup needs 2 players per position
+    short = [position for position, count in position_counts(args.teams, args.players_per_team).items() if count < 2]
+    if short:
+        parser.error(f"--teams/--players-per-team leave fewer than 2 players for {', '.join(short)}")
+    if args.commit_every and (args.in_memory or args.append_round):
+        parser.error("--commit-every only applies to full seeds written straight to the database")
+    if args.leaderboards and args.append_round:
+        parser.error("--leaderboards applies to full seeds; --append-round updates leaderboards that already exist")
+    return args
 
 def main():
     """Main function to populate database"""
+    global NUM_USERS, NUM_TEAMS, PLAYERS_PER_TEAM, NUM_ROUNDS, USE_NUMPY, WORKERS, SEED
+    global RESET_STRATEGY, RESET_SEQUENCES, FIRST_ROUND, PASSWORD_SCHEME, PASSWORD_SALT
+    global METRICS_PATH, METRICS_FORMAT, DEFER_INDEXES, COMMIT_EVERY, RESUME, MATERIALIZE_LEADERBOARDS
+    args = parse_args()
+    RESET_STRATEGY = args.reset
+    RESET_SEQUENCES = args.reset_sequences
+    PASSWORD_SCHEME = args.password_hash
+    PASSWORD_SALT = args.password_salt
+    METRICS_PATH = args.metrics
+    METRICS_FORMAT = args.metrics_format
+    DEFER_INDEXES = not args.keep_indexes
+    MATERIALIZE_LEADERBOARDS = args.leaderboards
+    COMMIT_EVERY = args.commit_every
+    RESUME = not args.restart
+    USE_NUMPY = USE_NUMPY and not args.no_numpy
+    WORKERS = args.workers
+    SEED = args.seed
+    if SEED is None and COMMIT_EVERY and RESUME:
+        SEED = checkpointed_seed()  # Resume an interrupted run with the seed it started with
+    if SEED is None:
+        SEED = random.randrange(2**32)
+    random.seed(SEED)
+    NUM_USERS = args.users
+    NUM_TEAMS = args.teams
+    PLAYERS_PER_TEAM = args.players_per_team
+    NUM_ROUNDS = args.rounds
+    
+    if args.totals == "recompute":
+        run_stage(recompute_total_points)
+        if METRICS_PATH:
+            write_metrics({"totals": "recompute"})
+        return
+    if args.totals == "verify":
+        drift = total_points_drift()
+        sys.exit(1 if any(table["rows"] for table in drift.values()) else 0)
+    
+    if args.append_round:
+        try:
+            FIRST_ROUND = NUM_ROUNDS = round_to_append()
+        except ValueError as error:
+            print(f"❌ {error}")
+            sys.exit(1)
+    
     print("Starting comprehensive dummy data insertion...")
     print(f"Database: {DB_PATH}")
-    print(f"Users: {len(USERS)}")
-    print(f"Teams: {len(TEAMS)}")
-    print(f"Total Players: {sum(len(players) for players in PLAYERS_BY_TEAM.values())}")
-    print(f"Rounds: 20 (with current round set to 21)")
+    if args.append_round:
+        print(f"Appending round {NUM_ROUNDS} to the existing data")
+    else:
+        print(f"Users: {NUM_USERS}")
+        print(f"Teams: {NUM_TEAMS}")
+        print(f"Total Players: {NUM_TEAMS * PLAYERS_PER_TEAM}")
+        print(f"Rounds: {NUM_ROUNDS} (with current round set to {NUM_ROUNDS + 1})")
+    print(f"Player stats: {'NumPy (vectorized)' if np is not None and USE_NUMPY else 'scalar Python'}")
+    print(f"Seed: {SEED}, workers: {WORKERS}")
+    if COMMIT_EVERY:
+        print(f"Commits: every {COMMIT_EVERY} rows with checkpoints (rerun to resume after an interruption)")
+    if PASSWORD_SCHEME != "sha256":
+        print(f"Passwords: {PASSWORD_SCHEME} with {PASSWORD_SALT} salts (users cannot log in to the app)")
     print("-" * 50)
     
-    # Clear existing data
-    clear_database()
-    
-    # Insert data in dependency order
-    insert_teams()
-    insert_players()
-    insert_users()
-    insert_user_round_teams()
-    insert_fantasy_teams()
-    insert_player_round_points()
-    insert_user_round_points()
-    create_current_round_table()
+    start = time.perf_counter()
+    seed = append_round if args.append_round else seed_database
+    if args.in_memory:
+        print("In-memory mode: the database is written once, after every stage has finished")
+        with in_memory_connection(keep_data=args.append_round) as conn:
+            seed(conn)
+    elif args.bulk:
+        print("Bulk-load mode: single connection and transaction")
+        with bulk_load_connection() as conn:
+            seed(conn)
+    else:
+        seed()
+    seconds = time.perf_counter() - start
+    print(f"Seeding took {seconds:.2f}s")
+    if METRICS_PATH:
+        write_metrics({"seed": SEED, "workers": WORKERS, "bulk": args.bulk, "users": NUM_USERS,
+                       "teams": NUM_TEAMS, "players_per_team": PLAYERS_PER_TEAM,
+                       "rounds": [FIRST_ROUND, NUM_ROUNDS], "seconds": seconds})
     
     # Validate the data
-    validation_success = validate_fantasy_teams()
+    validation = validate_fantasy_teams()
     
     print("-" * 50)
-    if validation_success:
+    if args.append_round:
+        if validation["error_count"]:
+            print(f"⚠️ Round {NUM_ROUNDS} appended with validation warnings!")
+        else:
+            print(f"✅ Round {NUM_ROUNDS} appended!")
+        print(f"• Current round set to {NUM_ROUNDS + 1}")
+        return
+    
+    if not validation["error_count"]:
         print("✅ Complete dummy data insertion finished!")
     else:
         print("⚠️ Dummy data insertion completed with validation warnings!")
     print("\n📊 Summary:")
-    print(f"• {len(USERS)} users created")
-    print(f"• {len(TEAMS)} teams created")
-    print(f"• {sum(len(players) for players in PLAYERS_BY_TEAM.values())} players created")
-    print(f"• 20 rounds of historical data created")
-    print(f"• Current round set to 21")
+    print(f"• {NUM_USERS} users created")
+    print(f"• {NUM_TEAMS} teams created")
+    print(f"• {NUM_TEAMS * PLAYERS_PER_TEAM} players created")
+    print(f"• {NUM_ROUNDS} rounds of historical data created")
+    print(f"• Current round set to {NUM_ROUNDS + 1}")
     print(f"• Fantasy teams, points, and budgets populated")
     print("\n🔑 Login Credentials:")
-    for user in USERS:
-        print(f"• {user['email']} / {user['password']}")
+    print(f"• user1@fantasy.com through user{NUM_USERS}@fantasy.com / user123")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Fantasy Scoring
+Python port of Web/Services/ScoringService.cs with configurable weights: scores
+single stat lines or whole NumPy arrays of them, and scores team lineups
+(every starter plus the best bench players) many lineups at a time. Run it
+directly to check it against the rules in the C# service
+"""
+
+import argparse
+import heapq
+import os
+import random
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Optional, only the array functions need it
+    np = None
+
+# C# service the weights and bench rule are checked against
+SCORING_SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Web", "Services",
+                                    "ScoringService.cs")
+
+# Fantasy points per unit of each statistic, plus the bonus for a team win and a loss
+FANTASY_WEIGHTS = {
+    "points": 1,
+    "rebounds": 1,
+    "assists": 1,
+    "steals": 2,
+    "blocks": 2,
+    "turnovers": -1,
+    "win": 5,
+    "loss": -3,
+}
+
+# Statistics in the argument order of ScoringService.CalculateFantasyPoints (followed by teamWin)
+STATISTICS = ["points", "rebounds", "assists", "steals", "blocks", "turnovers"]
+
+# Bench players counted on top of the starters
+BENCH_COUNTED = 3
+
+def fantasy_points(points, rebounds, assists, steals, blocks, turnovers, team_win, weights=None):
+    """ScoringService.CalculateFantasyPoints for one stat line, or element-wise for NumPy arrays.
+
+    team_win may be a bool or a 0/1 int (array).
+    """
+    weights = weights or FANTASY_WEIGHTS
+    return (points * weights["points"] + rebounds * weights["rebounds"] + assists * weights["assists"] +
+            steals * weights["steals"] + blocks * weights["blocks"] + turnovers * weights["turnovers"] +
+            weights["loss"] + (weights["win"] - weights["loss"]) * team_win)
+
+def fantasy_points_array(stats, weights=None):
+    """Fantasy points of every stat line in a dict of equally shaped arrays keyed by statistic and "team_win\""""
+    return fantasy_points(*(stats[name] for name in STATISTICS), stats["team_win"], weights)
+
+def team_score(team_players, bench_counted=BENCH_COUNTED):
+    """ScoringService.CalculateTeamScore for one lineup of (fantasy_points, is_on_court) pairs"""
+    starters = sum(points for points, is_on_court in team_players if is_on_court)
+    bench_players = (points for points, is_on_court in team_players if not is_on_court)
+    return starters + sum(heapq.nlargest(bench_counted, bench_players))
+
+def team_scores_array(points, on_court, bench_counted=BENCH_COUNTED):
+    """Team scores of many equally sized lineups at once.
+
+    points and on_court are (lineups, players) arrays. The best bench players
+    are picked with np.partition, so no lineup is fully sorted.
+    """
+    points = np.asarray(points, dtype=np.int64)
+    on_court = np.asarray(on_court, dtype=bool)
+    scores = np.where(on_court, points, 0).sum(axis=1)
+    
+    slots = points.shape[1]
+    counted = min(bench_counted, slots)
+    if counted > 0:
+        # Starters become the smallest value so they never land among the best bench slots
+        sentinel = np.iinfo(np.int64).min
+        bench = np.where(on_court, sentinel, points)
+        best = np.partition(bench, slots - counted, axis=1)[:, slots - counted:]
+        scores += np.where(best == sentinel, 0, best).sum(axis=1)
+    return scores
+
+def service_rules(path=SCORING_SERVICE_PATH):
+    """Weights and bench count as written in the C# ScoringService source.
+
+    Raises ValueError when the methods or their rules cannot be found in it.
+    """
+    with open(path) as source_file:
+        source = source_file.read()
+    
+    start = source.find("CalculateFantasyPoints(")
+    end = source.find("return fantasyPoints;", start)
+    if start < 0 or end < 0:
+        raise ValueError(f"CalculateFantasyPoints not found in {path}")
+    weights = {}
+    for sign, term, factor in re.findall(r"fantasyPoints\s*([+-])=\s*(\w+)(?:\s*\*\s*(\d+))?;", source[start:end]):
+        sign = -1 if sign == "-" else 1
+        if term.isdigit():
+            # The team result bonuses: the if (teamWin) branch comes first, then the else branch
+            weights["loss" if "win" in weights else "win"] = sign * int(term)
+        else:
+            weights[term] = sign * int(factor or 1)
+    if not weights:
+        raise ValueError(f"No scoring weights found in CalculateFantasyPoints of {path}")
+    
+    start = source.find("CalculateTeamScore(")
+    take = re.search(r"\.Take\((\d+)\)", source[start:]) if start >= 0 else None
+    if take is None:
+        raise ValueError(f"Bench rule of CalculateTeamScore not found in {path}")
+    return weights, int(take.group(1))
+
+def check_parity(samples=10_000, seed=0, service_path=SCORING_SERVICE_PATH):
+    """Compare this module with the C# rules and its array functions with the scalar ones.
+
+    Returns a list of mismatch descriptions; empty means everything agrees.
+    """
+    mismatches = []
+    try:
+        weights, bench_counted = service_rules(service_path)
+    except (OSError, ValueError) as error:
+        # Nothing to compare against is a failure, not a pass
+        mismatches.append(f"cannot read the C# rules: {error}")
+    else:
+        if weights != FANTASY_WEIGHTS:
+            mismatches.append(f"weights {FANTASY_WEIGHTS} differ from {service_path}: {weights}")
+        if bench_counted != BENCH_COUNTED:
+            mismatches.append(f"bench count {BENCH_COUNTED} differs from {service_path}: {bench_counted}")
+    
+    # Hand-checked stat lines: all zeros, a typical line, and the turnover/loss edge
+    for stats, team_win, expected in [((0, 0, 0, 0, 0, 0), False, -3), ((20, 8, 5, 2, 1, 3), True, 41),
+                                      ((0, 0, 0, 0, 0, 6), False, -9)]:
+        if fantasy_points(*stats, team_win) != expected:
+            mismatches.append(f"fantasy_points{(*stats, team_win)} = {fantasy_points(*stats, team_win)}, "
+                              f"expected {expected}")
+    if team_score([(10, True)] * 5 + [(4, False), (-2, False), (9, False), (4, False), (0, False)]) != 67:
+        mismatches.append("team_score of the hand-checked lineup is not 67")
+    
+    if np is None:
+        print("⚠️ NumPy is not installed; skipping the array functions")
+        return mismatches
+    
+    rng = random.Random(seed)
+    generator = np.random.default_rng(seed)
+    stats = {name: generator.integers(0, 40, size=samples) for name in STATISTICS}
+    stats["team_win"] = generator.integers(0, 2, size=samples)
+    vectorized = fantasy_points_array(stats).tolist()
+    for index in range(samples):
+        expected = fantasy_points(*(int(stats[name][index]) for name in STATISTICS),
+                                  bool(stats["team_win"][index]))
+        if vectorized[index] != expected:
+            mismatches.append(f"fantasy_points_array row {index} = {vectorized[index]}, expected {expected}")
+            break
+    
+    # Lineups with any number of starters, negative scores and ties
+    lineups = [[(rng.randint(-10, 60), rng.random() < 0.5) for _ in range(10)] for _ in range(samples)]
+    points = np.array([[player[0] for player in lineup] for lineup in lineups])
+    on_court = np.array([[player[1] for player in lineup] for lineup in lineups])
+    vectorized = team_scores_array(points, on_court).tolist()
+    for index, lineup in enumerate(lineups):
+        # Written like the LINQ in CalculateTeamScore: OrderByDescending(...).Take(3)
+        bench_players = sorted((points for points, is_on_court in lineup if not is_on_court), reverse=True)
+        expected = sum(points for points, is_on_court in lineup if is_on_court) + sum(bench_players[:BENCH_COUNTED])
+        if team_score(lineup) != expected or vectorized[index] != expected:
+            mismatches.append(f"lineup {index} scores {team_score(lineup)} (scalar) and {vectorized[index]} "
+                              f"(array), expected {expected}")
+            break
+    return mismatches
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Check the Python scoring rules against ScoringService.cs")
+    parser.add_argument("--samples", type=int, default=10_000,
+                        help="random stat lines and lineups to compare (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--service", default=SCORING_SERVICE_PATH,
+                        help=f"C# scoring service to compare with (default: {SCORING_SERVICE_PATH})")
+    return parser.parse_args()
+
+def main():
+    """Run the parity check and exit non-zero on any mismatch"""
+    args = parse_args()
+    mismatches = check_parity(args.samples, args.seed, args.service)
+    if mismatches:
+        print(f"❌ {len(mismatches)} scoring mismatches:")
+        for mismatch in mismatches:
+            print(f"  • {mismatch}")
+        sys.exit(1)
+    print(f"✅ Scoring matches {args.service} ({args.samples} stat lines and lineups compared)")
+
+if __name__ == "__main__":
+    main()